@@ -0,0 +1,88 @@
+import argparse
+import glob
+import os
+import time
+
+import generate_freq_json as gfj
+from likeness_models import NGRAM_MODELS
+
+# Compares the likeness models: training time, scoring throughput, and how well
+# each one separates real words (wordlist_new/*.txt) from known failed words
+# (fail_filter/fail1_clean.txt by default).
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_words(paths):
+    words = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            words.extend(line.strip().lower() for line in f if line.strip())
+    return list(dict.fromkeys(words))
+
+
+def auc(positives, negatives):
+    """Probability that a random real word outscores a random failed word (ties count half)."""
+    if not positives or not negatives:
+        return None
+    ranked = sorted([(s, 1) for s in positives] + [(s, 0) for s in negatives])
+    rank_sum = 0.0
+    i = 0
+    while i < len(ranked):
+        j = i
+        while j < len(ranked) and ranked[j][0] == ranked[i][0]:
+            j += 1
+        avg_rank = (i + j + 1) / 2
+        rank_sum += avg_rank * sum(1 for k in range(i, j) if ranked[k][1])
+        i = j
+    n_pos = len(positives)
+    return (rank_sum - n_pos * (n_pos + 1) / 2) / (n_pos * len(negatives))
+
+
+def bench_model(name, reference_file, real, failed):
+    start = time.perf_counter()
+    gfj.train_likeness_model(name, reference_file)
+    train_time = time.perf_counter() - start
+    scorer = gfj.get_likeness_scorer()
+
+    start = time.perf_counter()
+    real_scores = scorer.score_batch(real)
+    score_time = time.perf_counter() - start
+    failed_scores = scorer.score_batch(failed)
+
+    size = len(gfj.bigram_probs) if name == "bigram" else len(scorer.log_probs) + len(scorer.log_backoff)
+    return {
+        "model": name,
+        "entries": size,
+        "train_s": train_time,
+        "words_per_s": len(real) / score_time if score_time else float('inf'),
+        "real_mean": sum(real_scores) / len(real_scores) if real_scores else 0.0,
+        "failed_mean": sum(failed_scores) / len(failed_scores) if failed_scores else 0.0,
+        "auc": auc(real_scores, failed_scores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the word-likeness models against real and failed words.")
+    parser.add_argument("--reference", default=os.path.join(BASE_DIR, '1000000_clean.txt'), help="Training reference (default: 1000000_clean.txt)")
+    parser.add_argument("--real", action="append", help="Real-word txt files; repeatable (default: wordlist_new/*.txt)")
+    parser.add_argument("--failed", action="append", help="Failed-word txt files; repeatable (default: fail_filter/fail1_clean.txt)")
+    parser.add_argument("--models", nargs="+", default=["bigram"] + list(NGRAM_MODELS),
+                        choices=["bigram"] + list(NGRAM_MODELS), help="Models to compare (default: all)")
+    args = parser.parse_args()
+
+    real = read_words(args.real or sorted(glob.glob(os.path.join(BASE_DIR, 'wordlist_new', '*.txt'))))
+    failed = read_words(args.failed or [os.path.join(BASE_DIR, 'fail_filter', 'fail1_clean.txt')])
+    print(f"Real words: {len(real)}, failed words: {len(failed)}")
+
+    results = [bench_model(name, args.reference, real, failed) for name in args.models]
+
+    print(f"\n{'model':<8} {'entries':>9} {'train s':>8} {'words/s':>10} {'real':>7} {'failed':>7} {'AUC':>6}")
+    for r in results:
+        auc_text = f"{r['auc']:.3f}" if r['auc'] is not None else "n/a"
+        print(f"{r['model']:<8} {r['entries']:>9} {r['train_s']:>8.2f} {r['words_per_s']:>10.0f} "
+              f"{r['real_mean']:>7.2f} {r['failed_mean']:>7.2f} {auc_text:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+import argparse
+import glob
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+# Compact binary wordlist (.wlb), written once by the export stage and mmapped
+# by every consumer (game server, expansion tools) instead of reparsing JSON.
+#
+# Layout (little-endian):
+#   header   : magic(8s) count(u32) blob_size(u32) flags(u32) reserved(u32)
+#   offsets  : u32 * (count + 1)     word i is blob[offsets[i]:offsets[i + 1]]
+#   blob     : utf-8 words, sorted bytewise, no separators
+#   padding  : to a 4-byte boundary
+#   freq     : i32 * count           score * 100, only if FLAG_FREQ
+#   like     : i32 * count           score * 100, only if FLAG_LIKE
+#   pos      : u8 * count            part-of-speech bitmask, only if FLAG_POS
+#
+# Scores are stored as fixed-point hundredths, which round-trips the
+# 2-decimal values the scoring tools write; MISSING marks an absent score.
+
+MAGIC = b"WLBIN1\x00\x00"
+HEADER = struct.Struct("<8sIIII")
+
+FLAG_FREQ = 1
+FLAG_LIKE = 2
+FLAG_POS = 4
+
+MISSING = -(2 ** 31)
+SCALE = 100
+
+
+def _to_fixed(value):
+    return MISSING if value is None else int(round(value * SCALE))
+
+
+def _from_fixed(value):
+    return None if value == MISSING else value / SCALE
+
+
+def write_binary(path, entries):
+    """
+    Write `entries`, an iterable of (word, freq, like) or (word, freq, like, pos)
+    with any value possibly None, as a .wlb file. Entries are sorted here;
+    duplicate words keep the last value.
+    """
+    if sys.byteorder != "little":
+        raise RuntimeError("binary wordlists are only written on little-endian hosts")
+    data = {}
+    for word, freq, like, *pos in entries:
+        data[word.encode("utf-8")] = (freq, like, pos[0] if pos else None)
+    keys = sorted(data)
+
+    flags = 0
+    if any(v[0] is not None for v in data.values()):
+        flags |= FLAG_FREQ
+    if any(v[1] is not None for v in data.values()):
+        flags |= FLAG_LIKE
+    if any(v[2] is not None for v in data.values()):
+        flags |= FLAG_POS
+
+    offsets = array("I", [0])
+    for k in keys:
+        offsets.append(offsets[-1] + len(k))
+    blob = b"".join(keys)
+    padding = b"\x00" * (-len(blob) % 4)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(keys), len(blob), flags, 0))
+        f.write(offsets.tobytes())
+        f.write(blob)
+        f.write(padding)
+        if flags & FLAG_FREQ:
+            f.write(array("i", (_to_fixed(data[k][0]) for k in keys)).tobytes())
+        if flags & FLAG_LIKE:
+            f.write(array("i", (_to_fixed(data[k][1]) for k in keys)).tobytes())
+        if flags & FLAG_POS:
+            f.write(bytes(data[k][2] or 0 for k in keys))
+    # Readers may have the old file mapped; replace atomically
+    os.replace(tmp_path, path)
+    return len(keys)
+
+
+def load_json_entries(json_path):
+    """(word, freq, like) from either JSON shape: {word: zipf} or {word: {"freq", "like"}}."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for word, value in data.items():
+        if isinstance(value, dict):
+            yield word, value.get("freq"), value.get("like")
+        else:
+            yield word, value, None
+
+
+def export_json(json_path, out_path=None):
+    out_path = out_path or os.path.splitext(json_path)[0] + ".wlb"
+    count = write_binary(out_path, load_json_entries(json_path))
+    print(f"Exported {count} words: {os.path.basename(json_path)} -> {os.path.basename(out_path)}")
+    return out_path
+
+
+class BinaryWordlist:
+    """
+    Read-only, mmapped view of a .wlb file. Lookups binary-search the offsets
+    table directly in the mapping; nothing is parsed up front, so opening a
+    category is O(1) and the pages are shared between processes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, blob_size, flags, _ = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a binary wordlist")
+        self.count = count
+        self.flags = flags
+
+        view = memoryview(self._mm)
+        pos = HEADER.size
+        self._offsets = view[pos:pos + 4 * (count + 1)].cast("I")
+        pos += 4 * (count + 1)
+        self._blob_start = pos
+        pos += blob_size + (-blob_size % 4)
+        self._freq = None
+        self._like = None
+        self._pos = None
+        if flags & FLAG_FREQ:
+            self._freq = view[pos:pos + 4 * count].cast("i")
+            pos += 4 * count
+        if flags & FLAG_LIKE:
+            self._like = view[pos:pos + 4 * count].cast("i")
+            pos += 4 * count
+        if flags & FLAG_POS:
+            self._pos = view[pos:pos + count]
+            pos += count
+
+    def close(self):
+        # Release the memoryviews before the mapping itself
+        for name in ("_offsets", "_freq", "_like", "_pos"):
+            view = getattr(self, name)
+            if view is not None:
+                view.release()
+                setattr(self, name, None)
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def _key(self, i):
+        start = self._blob_start
+        return self._mm[start + self._offsets[i]:start + self._offsets[i + 1]]
+
+    def word_at(self, i):
+        return self._key(i).decode("utf-8")
+
+    def _bisect(self, key, lo=0):
+        hi = self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def index(self, word):
+        """Position of `word`, or -1 if it is not in the list."""
+        key = word.encode("utf-8")
+        i = self._bisect(key)
+        if i < self.count and self._key(i) == key:
+            return i
+        return -1
+
+    def __contains__(self, word):
+        return self.index(word) >= 0
+
+    def scores_at(self, i):
+        freq = _from_fixed(self._freq[i]) if self._freq is not None else None
+        like = _from_fixed(self._like[i]) if self._like is not None else None
+        return freq, like
+
+    def pos_at(self, i):
+        """POS bitmask of the word at position i (0 when the file has no POS column)."""
+        return self._pos[i] if self._pos is not None else 0
+
+    def get(self, word, default=None):
+        """(freq, like) for `word`, or `default` when it is not in the list."""
+        i = self.index(word)
+        return self.scores_at(i) if i >= 0 else default
+
+    def positions(self, words):
+        """
+        {word: position} for the words of `words` that are in the list. The
+        query is sorted and joined against the table in one pass: a linear
+        merge when it is large relative to the table, otherwise a bisect per
+        word starting where the previous one ended.
+        """
+        # UTF-8 byte order is code point order, so the str sort matches the table
+        query = sorted(set(words))
+        found = {}
+        count = self.count
+        if not query or not count:
+            return found
+        if len(query) * max(count.bit_length(), 1) < count:
+            i = 0
+            for word in query:
+                key = word.encode("utf-8")
+                i = self._bisect(key, i)
+                if i >= count:
+                    break
+                if self._key(i) == key:
+                    found[word] = i
+            return found
+
+        offsets = self._offsets.tolist()
+        blob = self._mm[self._blob_start:self._blob_start + offsets[count]]
+        i = 0
+        start = 0
+        end = offsets[1]
+        table_key = blob[start:end]
+        for word in query:
+            key = word.encode("utf-8")
+            while table_key < key:
+                i += 1
+                if i >= count:
+                    return found
+                start = end
+                end = offsets[i + 1]
+                table_key = blob[start:end]
+            if table_key == key:
+                found[word] = i
+        return found
+
+    def get_many(self, words):
+        """{word: (freq, like)} for the words of `words` that are in the list."""
+        return {w: self.scores_at(i) for w, i in self.positions(words).items()}
+
+    def prefix_range(self, prefix):
+        """[start, end) positions of all words starting with `prefix`."""
+        key = prefix.encode("utf-8")
+        start = self._bisect(key)
+        end = start
+        # Every byte string with this prefix sorts before prefix + b"\xff"
+        if key:
+            end = self._bisect(key + b"\xff", start)
+        else:
+            end = self.count
+        return start, end
+
+    def words_with_prefix(self, prefix):
+        start, end = self.prefix_range(prefix)
+        return [self.word_at(i) for i in range(start, end)]
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.word_at(i)
+
+    def items(self):
+        """Yield (word, freq, like) in sorted order."""
+        for i in range(self.count):
+            yield (self.word_at(i),) + self.scores_at(i)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export scored JSON wordlists to the compact binary (.wlb) format, or query one.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_export = sub.add_parser("export", help="Convert JSON files (or every *.json in directories) to .wlb")
+    p_export.add_argument("paths", nargs="+", help="JSON files or directories")
+    p_export.add_argument("--out-dir", help="Write .wlb files here instead of next to each JSON")
+
+    p_lookup = sub.add_parser("lookup", help="Look up words or a prefix in a .wlb file")
+    p_lookup.add_argument("wlb", help="Path to .wlb file")
+    p_lookup.add_argument("words", nargs="*", help="Words to look up")
+    p_lookup.add_argument("--prefix", help="List words starting with this prefix")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        json_files = []
+        for path in args.paths:
+            if os.path.isdir(path):
+                json_files.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+            else:
+                json_files.append(path)
+        if args.out_dir and not os.path.exists(args.out_dir):
+            os.makedirs(args.out_dir)
+        for json_path in json_files:
+            out_path = None
+            if args.out_dir:
+                out_path = os.path.join(args.out_dir, os.path.splitext(os.path.basename(json_path))[0] + ".wlb")
+            try:
+                export_json(json_path, out_path)
+            except Exception as e:
+                print(f"Error exporting {json_path}: {e}")
+    else:
+        with BinaryWordlist(args.wlb) as wl:
+            print(f"{args.wlb}: {len(wl)} words")
+            for word in args.words:
+                print(f"{word}: {wl.get(word, 'not found')}")
+            if args.prefix is not None:
+                matches = wl.words_with_prefix(args.prefix)
+                print(f"{len(matches)} words start with '{args.prefix}': {matches[:20]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,80 @@
+import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor
+
 import nltk
 from nltk.corpus import wordnet
 
+from binary_wordlist import write_binary
+from wordnet_index import get_pos_index, pos_names
+
+# Common English Pronouns list
+PRONOUNS_LIST = {
+    'i', 'me', 'my', 'mine', 'myself',
+    'we', 'us', 'our', 'ours', 'ourselves',
+    'you', 'your', 'yours', 'yourself', 'yourselves',
+    'he', 'him', 'his', 'himself',
+    'she', 'her', 'hers', 'herself',
+    'it', 'its', 'itself',
+    'they', 'them', 'their', 'theirs', 'themselves',
+    'this', 'that', 'these', 'those',
+    'who', 'whom', 'whose', 'which', 'what',
+    'anybody', 'anyone', 'anything',
+    'each', 'either', 'everybody', 'everyone', 'everything',
+    'neither', 'nobody', 'noone', 'nothing', 'one',
+    'somebody', 'someone', 'something',
+    'both', 'few', 'many', 'several',
+    'all', 'any', 'most', 'none', 'some'
+}
+
+# Common Conjunctions & Prepositions list (often tagged as IN/CC in NLTK)
+CONJUNCTIONS_LIST = {
+    'and', 'but', 'or', 'nor', 'for', 'yet', 'so',
+    'after', 'although', 'as', 'because', 'before',
+    'even', 'if', 'lest', 'once', 'only', 'since',
+    'than', 'that', 'though', 'till', 'unless',
+    'until', 'when', 'whenever', 'where', 'whereas',
+    'wherever', 'whether', 'while',
+    'aboard', 'about', 'above', 'across', 'after', 'against',
+    'along', 'amid', 'among', 'anti', 'around', 'as',
+    'at', 'before', 'behind', 'below', 'beneath', 'beside',
+    'besides', 'between', 'beyond', 'but', 'by', 'concerning',
+    'considering', 'despite', 'down', 'during', 'except',
+    'excepting', 'excluding', 'following', 'for', 'from',
+    'in', 'inside', 'into', 'like', 'minus', 'near',
+    'of', 'off', 'on', 'onto', 'opposite', 'outside',
+    'over', 'past', 'per', 'plus', 'regarding', 'round',
+    'save', 'since', 'than', 'through', 'to', 'toward',
+    'towards', 'under', 'underneath', 'unlike', 'until',
+    'up', 'upon', 'versus', 'via', 'with', 'within', 'without',
+    'the', 'a', 'an' # Articles often end up here too
+}
+
+CATEGORIES = ('nouns', 'verbs', 'adjectives', 'adverbs', 'pronouns', 'conjunctions', 'uncategorized')
+
+# Per-category wordlist written for each category
+CATEGORY_FILES = {
+    'nouns': 'nouns.txt',
+    'verbs': 'verb.txt',
+    'adjectives': 'adjectives.txt',
+    'adverbs': 'adverbs.txt',
+    'pronouns': 'pronouns.txt',
+    'conjunctions': 'conjunctions.txt',
+    'uncategorized': 'others.txt'
+}
+
+# Category bits in the POS column of the columnar table (words.wlb)
+CATEGORY_BITS = {cat: 1 << i for i, cat in enumerate(CATEGORIES)}
+COLUMNAR_FILE = 'words.wlb'
+
 def get_wordnet_pos(word):
     """
     Returns a set of POS tags found in WordNet for the given word.
     Map: n->noun, v->verb, a/s->adj, r->adv
     """
+    index = get_pos_index()
+    if index is not None:
+        return index.pos_set(word)
     synsets = wordnet.synsets(word)
     pos_found = set()
     for syn in synsets:
@@ -21,7 +89,125 @@ def get_wordnet_pos(word):
             pos_found.add('adv')
     return pos_found
 
+def _add_pos(categorized, word, pos_set):
+    # Add to respective sets
+    if 'noun' in pos_set:
+        categorized['nouns'].add(word)
+    if 'verb' in pos_set:
+        categorized['verbs'].add(word)
+    if 'adj' in pos_set:
+        categorized['adjectives'].add(word)
+    if 'adv' in pos_set:
+        categorized['adverbs'].add(word)
+
+def classify_chunk(words):
+    """
+    {category: set of words} for one chunk. Words WordNet does not know are
+    tagged together with one pos_tag_sents call; each is still its own
+    one-word sentence, so the tags match calling nltk.pos_tag([word]) per word.
+    """
+    categorized = {cat: set() for cat in CATEGORIES}
+    # One join against the precomputed POS index instead of a synsets() call per word
+    index = get_pos_index()
+    masks = index.masks(words) if index is not None else None
+    misses = []
+    for word in words:
+        # Check explicit pronoun list first
+        if word in PRONOUNS_LIST:
+            categorized['pronouns'].add(word)
+            continue
+            
+        # Check explicit conjunctions/prepositions list
+        if word in CONJUNCTIONS_LIST:
+            categorized['conjunctions'].add(word)
+            continue
+
+        pos_set = pos_names(masks[word]) if masks is not None else get_wordnet_pos(word)
+        if not pos_set:
+            misses.append(word)
+            continue
+        _add_pos(categorized, word, pos_set)
+
+    if not misses:
+        return categorized
+
+    # Fallback: try nltk pos_tag for single word (heuristic)
+    for word, tag in (tags[0] for tags in nltk.pos_tag_sents([[w] for w in misses])):
+        pos_set = set()
+        if tag in ['PRP', 'PRP$', 'WP', 'WP$']: # Pronoun tags
+            categorized['pronouns'].add(word)
+        elif tag in ['CC', 'IN', 'DT', 'TO']: # Conjunction/Preposition/Determiner tags
+            categorized['conjunctions'].add(word)
+        elif tag.startswith('N'):
+            pos_set.add('noun')
+        elif tag.startswith('V'):
+            pos_set.add('verb')
+        elif tag.startswith('J'):
+            pos_set.add('adj')
+        elif tag.startswith('R'):
+            pos_set.add('adv')
+        else:
+            categorized['uncategorized'].add(word)
+            continue
+        _add_pos(categorized, word, pos_set)
+    return categorized
+
+def _init_worker():
+    # Load the POS index (or the WordNet corpus) and the tagger once per process, not per chunk
+    if get_pos_index() is None:
+        wordnet.ensure_loaded()
+    nltk.pos_tag(['the'])
+
+def classify_words(words, workers=1, chunk_size=20000):
+    """
+    Classify `words` into CATEGORIES, serially or across `workers` processes
+    (0 = all cores). Results are merged as sets, so they do not depend on the
+    number of workers or the chunk size.
+    """
+    chunks = [words[i:i + chunk_size] for i in range(0, len(words), chunk_size)]
+    categorized = {cat: set() for cat in CATEGORIES}
+    count = 0
+    # Build the POS index here if needed, so workers do not race to build it
+    get_pos_index()
+
+    def merge(result, size):
+        nonlocal count
+        for cat, found in result.items():
+            categorized[cat].update(found)
+        count += size
+        print(f"Processed {count}/{len(words)} words...")
+
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            merge(classify_chunk(chunk), len(chunk))
+        return categorized
+
+    with ProcessPoolExecutor(max_workers=workers or None, initializer=_init_worker) as executor:
+        for chunk, result in zip(chunks, executor.map(classify_chunk, chunks)):
+            merge(result, len(chunk))
+    return categorized
+
+def write_columnar(categorized, path):
+    """
+    One row per distinct word with all its categories as a bitmask, instead of
+    the word repeated in every category file. freq/like are filled in later by
+    generate_freq_json.py --columnar.
+    """
+    masks = {}
+    for cat, words in categorized.items():
+        bit = CATEGORY_BITS[cat]
+        for w in words:
+            masks[w] = masks.get(w, 0) | bit
+    return write_binary(path, ((w, None, None, mask) for w, mask in masks.items()))
+
 def main():
+    parser = argparse.ArgumentParser(description="Split the cleaned reference list into per-POS wordlists using WordNet.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of classification processes (default: 1 = serial, 0 = all cores)")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="Words per chunk sent to each worker (default: 20000)")
+    parser.add_argument("--output-format", choices=["txt", "columnar", "both"], default="txt",
+                        help="Per-category txt files, one columnar words.wlb table with a category bitmask, or both (default: txt)")
+    args = parser.parse_args()
+
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     input_file = os.path.join(base_dir, '1000000_clean.txt')
     output_dir = os.path.join(base_dir, 'wordlist_new')
@@ -40,122 +226,20 @@ def main():
 
     print(f"Loaded {len(words)} words. Starting classification...")
 
-    # Categories
-    categorized = {
-        'nouns': set(),
-        'verbs': set(),
-        'adjectives': set(),
-        'adverbs': set(),
-        'pronouns': set(),
-        'conjunctions': set(),
-        'uncategorized': set()
-    }
-    
-    # Common English Pronouns list
-    PRONOUNS_LIST = {
-        'i', 'me', 'my', 'mine', 'myself',
-        'we', 'us', 'our', 'ours', 'ourselves',
-        'you', 'your', 'yours', 'yourself', 'yourselves',
-        'he', 'him', 'his', 'himself',
-        'she', 'her', 'hers', 'herself',
-        'it', 'its', 'itself',
-        'they', 'them', 'their', 'theirs', 'themselves',
-        'this', 'that', 'these', 'those',
-        'who', 'whom', 'whose', 'which', 'what',
-        'anybody', 'anyone', 'anything',
-        'each', 'either', 'everybody', 'everyone', 'everything',
-        'neither', 'nobody', 'noone', 'nothing', 'one',
-        'somebody', 'someone', 'something',
-        'both', 'few', 'many', 'several',
-        'all', 'any', 'most', 'none', 'some'
-    }
-
-    # Common Conjunctions & Prepositions list (often tagged as IN/CC in NLTK)
-    CONJUNCTIONS_LIST = {
-        'and', 'but', 'or', 'nor', 'for', 'yet', 'so',
-        'after', 'although', 'as', 'because', 'before',
-        'even', 'if', 'lest', 'once', 'only', 'since',
-        'than', 'that', 'though', 'till', 'unless',
-        'until', 'when', 'whenever', 'where', 'whereas',
-        'wherever', 'whether', 'while',
-        'aboard', 'about', 'above', 'across', 'after', 'against',
-        'along', 'amid', 'among', 'anti', 'around', 'as',
-        'at', 'before', 'behind', 'below', 'beneath', 'beside',
-        'besides', 'between', 'beyond', 'but', 'by', 'concerning',
-        'considering', 'despite', 'down', 'during', 'except',
-        'excepting', 'excluding', 'following', 'for', 'from',
-        'in', 'inside', 'into', 'like', 'minus', 'near',
-        'of', 'off', 'on', 'onto', 'opposite', 'outside',
-        'over', 'past', 'per', 'plus', 'regarding', 'round',
-        'save', 'since', 'than', 'through', 'to', 'toward',
-        'towards', 'under', 'underneath', 'unlike', 'until',
-        'up', 'upon', 'versus', 'via', 'with', 'within', 'without',
-        'the', 'a', 'an' # Articles often end up here too
-    }
-
-    count = 0
-    for word in words:
-        count += 1
-        if count % 10000 == 0:
-            print(f"Processed {count}/{len(words)} words...")
-            
-        # Check explicit pronoun list first
-        if word in PRONOUNS_LIST:
-            categorized['pronouns'].add(word)
-            continue
-            
-        # Check explicit conjunctions/prepositions list
-        if word in CONJUNCTIONS_LIST:
-            categorized['conjunctions'].add(word)
-            continue
-
-        pos_set = get_wordnet_pos(word)
-        
-        if not pos_set:
-            # Fallback: try nltk pos_tag for single word (heuristic)
-            tags = nltk.pos_tag([word])
-            tag = tags[0][1]
-            
-            if tag in ['PRP', 'PRP$', 'WP', 'WP$']: # Pronoun tags
-                categorized['pronouns'].add(word)
-            elif tag in ['CC', 'IN', 'DT', 'TO']: # Conjunction/Preposition/Determiner tags
-                categorized['conjunctions'].add(word)
-            elif tag.startswith('N'):
-                pos_set.add('noun')
-            elif tag.startswith('V'):
-                pos_set.add('verb')
-            elif tag.startswith('J'):
-                pos_set.add('adj')
-            elif tag.startswith('R'):
-                pos_set.add('adv')
-            else:
-                categorized['uncategorized'].add(word)
-                continue
-
-        # Add to respective sets
-        if 'noun' in pos_set:
-            categorized['nouns'].add(word)
-        if 'verb' in pos_set:
-            categorized['verbs'].add(word)
-        if 'adj' in pos_set:
-            categorized['adjectives'].add(word)
-        if 'adv' in pos_set:
-            categorized['adverbs'].add(word)
+    categorized = classify_words(words, workers=args.workers, chunk_size=args.chunk_size)
 
     print("Classification done. Writing files...")
 
+    if args.output_format in ("columnar", "both"):
+        out_path = os.path.join(output_dir, COLUMNAR_FILE)
+        count = write_columnar(categorized, out_path)
+        print(f"Wrote {count} distinct words to {COLUMNAR_FILE}")
+        if args.output_format == "columnar":
+            print("All done!")
+            return
+
     # Write outputs
-    files_map = {
-        'nouns': 'nouns.txt',
-        'verbs': 'verb.txt',
-        'adjectives': 'adjectives.txt',
-        'adverbs': 'adverbs.txt',
-        'pronouns': 'pronouns.txt',
-        'conjunctions': 'conjunctions.txt',
-        'uncategorized': 'others.txt'
-    }
-
-    for cat, filename in files_map.items():
+    for cat, filename in CATEGORY_FILES.items():
         out_path = os.path.join(output_dir, filename)
         data = sorted(list(categorized[cat]))
         print(f"Writing {len(data)} words to {filename}...")
@@ -1,59 +1,31 @@
-import re
+import argparse
+import heapq
 import os
 import sys
+import tempfile
 
-def is_valid_word(word):
-    # 1. Strict a-z (implies no space, dash, apostrophe, symbols, numbers)
-    if not re.fullmatch(r'^[a-z]+$', word):
-        return False
-    
-    # 2. Length check (min 2 chars)
-    if len(word) < 2:
-        return False
-
-    # 3. Must contain at least one vowel (including y)
-    if not re.search(r'[aeiouy]', word):
-        return False
+from word_rules import format_counts, iter_valid_words, new_counts
 
-    # 4. No repeated char spam (max 2 consecutive identical chars allowed)
-    # e.g. "aa" ok, "aaa" bad.
-    if re.search(r'(.)\1\1', word):
-        return False
+# Rough CPython cost of one short str held in a set (object + hash slot + growth)
+WORD_OVERHEAD_BYTES = 120
 
-    # 5. Anti-consonant cluster extreme (limit to < 7 consecutive consonants)
-    # English words can have complex clusters (e.g. 'catchphrase' -> 'tchphr' = 6)
-    # So we reject 7 or more.
-    if re.search(r'[bcdfghjklmnpqrstvwxz]{7,}', word):
-        return False
-
-    return True
+# Maximum number of run files merged at once (keeps open file handles bounded)
+MERGE_FAN_IN = 64
 
 def clean_reference(input_path, output_path):
     print(f"Cleaning {input_path}...")
     
-    unique_words = set()
-    total_lines = 0
-    valid_count = 0
-    
+    # Lowercase, strip and validate in one pass over the file buffer
+    counts = new_counts()
     try:
-        with open(input_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                total_lines += 1
-                # Lowercase and strip
-                word = line.strip().lower()
-                
-                if is_valid_word(word):
-                    unique_words.add(word)
-                    valid_count += 1
-                
-                if total_lines % 100000 == 0:
-                    print(f"Processed {total_lines} lines...")
-                    
+        unique_words = set(iter_valid_words(input_path, counts))
     except FileNotFoundError:
         print(f"Error: File not found: {input_path}")
         return
 
+    total_lines = sum(counts.values())
     print(f"Finished processing. Total lines: {total_lines}")
+    print(f"Validation: {format_counts(counts)}")
     print(f"Unique valid words: {len(unique_words)}")
     
     # Sort A-Z
@@ -68,12 +40,102 @@ def clean_reference(input_path, output_path):
     except Exception as e:
         print(f"Error writing file: {e}")
 
+def _write_run(words, run_dir, run_no):
+    path = os.path.join(run_dir, f"run_{run_no:05d}.txt")
+    with open(path, 'w', encoding='utf-8') as f:
+        for w in sorted(words):
+            f.write(w + '\n')
+    return path
+
+def _merge_runs(paths, output_path):
+    # k-way merge of sorted, deduplicated runs; duplicates across runs are adjacent
+    files = [open(p, 'r', encoding='utf-8') for p in paths]
+    written = 0
+    try:
+        with open(output_path, 'w', encoding='utf-8') as out:
+            last = None
+            for line in heapq.merge(*files):
+                if line != last:
+                    out.write(line)
+                    written += 1
+                    last = line
+    finally:
+        for f in files:
+            f.close()
+    return written
+
+def clean_reference_streaming(input_path, output_path, max_memory_mb=256):
+    """
+    Same output as clean_reference, but with peak memory bounded by max_memory_mb:
+    valid words are collected until the budget is reached, spilled to disk as a
+    sorted, deduplicated run, and all runs are k-way merged into output_path.
+    """
+    print(f"Cleaning {input_path} (streaming, max memory {max_memory_mb} MB)...")
+    budget = int(max_memory_mb * 1024 * 1024)
+    # Leave room for the read buffer next to the in-memory run
+    block_size = max(64 * 1024, min(1 << 22, budget // 8))
+    run_budget = max(budget - 2 * block_size, budget // 2)
+
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    counts = new_counts()
+    with tempfile.TemporaryDirectory(prefix="clean_runs_", dir=out_dir) as run_dir:
+        runs = []
+        current = set()
+        used = 0
+        try:
+            for w in iter_valid_words(input_path, counts, block_size=block_size):
+                if w in current:
+                    continue
+                current.add(w)
+                used += len(w) + WORD_OVERHEAD_BYTES
+                if used >= run_budget:
+                    runs.append(_write_run(current, run_dir, len(runs)))
+                    print(f"Spilled run {len(runs)} ({len(current)} words)")
+                    current = set()
+                    used = 0
+        except FileNotFoundError:
+            print(f"Error: File not found: {input_path}")
+            return
+        if current or not runs:
+            runs.append(_write_run(current, run_dir, len(runs)))
+        current = None
+
+        total_lines = sum(counts.values())
+        print(f"Finished processing. Total lines: {total_lines}")
+        print(f"Validation: {format_counts(counts)}")
+
+        # Merge in rounds when there are more runs than we want open at once
+        round_no = 0
+        while len(runs) > MERGE_FAN_IN:
+            merged = []
+            for i in range(0, len(runs), MERGE_FAN_IN):
+                path = os.path.join(run_dir, f"merge_{round_no:02d}_{i // MERGE_FAN_IN:05d}.txt")
+                _merge_runs(runs[i:i + MERGE_FAN_IN], path)
+                merged.append(path)
+            runs = merged
+            round_no += 1
+
+        print(f"Merging {len(runs)} run(s) into {output_path}...")
+        try:
+            written = _merge_runs(runs, output_path)
+        except Exception as e:
+            print(f"Error writing file: {e}")
+            return
+    print(f"Unique valid words: {written}")
+    print("Done!")
+
 def main():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    input_file = os.path.join(base_dir, '1000000.txt')
-    output_file = os.path.join(base_dir, '1000000_clean.txt')
-    
-    clean_reference(input_file, output_file)
+    parser = argparse.ArgumentParser(description="Clean the reference word dump into a sorted, unique, valid word list.")
+    parser.add_argument("input", nargs="?", default=os.path.join(base_dir, '1000000.txt'), help="Raw reference txt (default: 1000000.txt)")
+    parser.add_argument("output", nargs="?", default=os.path.join(base_dir, '1000000_clean.txt'), help="Cleaned output (default: 1000000_clean.txt)")
+    parser.add_argument("--max-memory", type=float, help="Stream with an external sort, keeping peak memory around this many MB")
+    args = parser.parse_args()
+
+    if args.max_memory:
+        clean_reference_streaming(args.input, args.output, max_memory_mb=args.max_memory)
+    else:
+        clean_reference(args.input, args.output)
 
 if __name__ == "__main__":
     main()
@@ -1,83 +1,79 @@
 import argparse
-import bisect
-import re
 import sys
 import os
 
-# Strict rules
-WORD_RE = re.compile(r"^[a-z]+$")
-VOWEL_RE = re.compile(r"[aeiouy]")
+# Make the shared modules in tools/ importable when run from tools/expand/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def normalize_word(w: str) -> str:
-    return w.strip().lower()
-
-def is_valid_word(w: str) -> bool:
-    return len(w) >= 2 and bool(WORD_RE.fullmatch(w)) and bool(VOWEL_RE.search(w))
+from prefix_index import load_or_build
+from word_rules import is_valid_word, iter_valid_words, normalize_word
+from preprocess_wordlist import preprocess_many
+from word_filter import FilteredWordlist
 
 def load_wordlist(path):
     words = set()
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            for line in f:
-                w = normalize_word(line)
-                if is_valid_word(w):
-                    words.add(w)
+        words.update(iter_valid_words(path))
     except FileNotFoundError:
         print(f"Warning: File not found: {path}")
     return words
 
-def expand_specific_word(seed_word, reference_path, target_dirs):
-    seed = normalize_word(seed_word)
-    if not is_valid_word(seed):
-        print(f"Error: '{seed}' is not a valid word format (must be a-z, >=2 chars, has vowel).")
+def load_seeds_file(path):
+    seeds = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            w = normalize_word(line)
+            if w and not w.startswith('#'):
+                seeds.append(w)
+    return seeds
+
+def expand_seeds(seed_words, reference_path, target_dirs):
+    """
+    Expand many seed words in one run: the reference and every target file are
+    loaded once, all expansions are applied in memory, and each touched file is
+    written and re-scored once.
+    """
+    seeds = []
+    for seed_word in seed_words:
+        seed = normalize_word(seed_word)
+        if not is_valid_word(seed):
+            print(f"Error: '{seed}' is not a valid word format (must be a-z, >=2 chars, has vowel, no 'aaa' runs or 7+ consonant clusters).")
+            continue
+        if seed not in seeds:
+            seeds.append(seed)
+    if not seeds:
         return
 
-    print(f"Expanding seed word: '{seed}'")
+    print(f"Expanding {len(seeds)} seed word(s): {seeds[:10]}{' ...' if len(seeds) > 10 else ''}")
 
-    # 1. Load Reference (1000000.txt)
+    # 1. Load Reference (1000000.txt) once, reusing the saved prefix index when fresh
     print(f"Loading reference from {reference_path}...")
     try:
-        ref_words_raw = load_wordlist(reference_path)
-        ref_words_sorted = sorted(list(ref_words_raw))
-        print(f"Loaded {len(ref_words_sorted)} unique valid reference words.")
+        index = load_or_build(reference_path, reference_path + ".pidx", load_wordlist)
+        print(f"Loaded {len(index)} unique valid reference words.")
     except Exception as e:
         print(f"Error loading reference: {e}")
         return
 
-    # 2. Find matches in reference
-    matches = set()
-    idx = bisect.bisect_left(ref_words_sorted, seed)
-    
-    print(f"Scanning reference for words STRICTLY starting with '{seed}'...")
-    
-    while idx < len(ref_words_sorted):
-        candidate = ref_words_sorted[idx]
-        
-        # STRICT PREFIX CHECK
-        if candidate.startswith(seed):
-            # Additional strict filtering (no repeated chars, valid word format)
-            if not re.search(r'(.)\1\1', candidate) and is_valid_word(candidate):
-                matches.add(candidate)
-            idx += 1
-        else:
-            # Since the list is sorted, as soon as we find a word that DOES NOT 
-            # start with the seed, we can stop. All subsequent words will also 
-            # not match.
-            # Example: seed='gym', candidate='gynaecology' -> Stop.
-            # Example: seed='gym', candidate='energy' -> would never be reached/checked here if list is sorted correctly.
-            break
-    
-    if not matches:
-        print(f"No matches found in reference for seed '{seed}'.")
-        return
+    # 2. Find matches in reference.
+    # STRICT PREFIX CHECK: only words starting with the seed; the index already
+    # drops repeated-char spam and invalid formats.
+    matches_by_seed = {}
+    for seed in seeds:
+        matches = index.words_with_prefix(seed)
+        if not matches:
+            print(f"No matches found in reference for seed '{seed}'.")
+            continue
+        print(f"Found {len(matches)} matches for '{seed}' (e.g. {matches[:5]}).")
+        matches_by_seed[seed] = matches
 
-    print(f"Found {len(matches)} matches in reference (e.g. {sorted(list(matches))[:5]}).")
-    print(f"Verified: All {len(matches)} matches start with '{seed}'.")
+    if not matches_by_seed:
+        return
 
     # 3. Check ALL txt files in target directories
-    # Logic: If a txt file ALREADY contains the seed word (or related forms), 
-    # we assume it's the right place to put the expansions.
-    # OR: The user asked to "cari kata di semua file txt yang ada gym lalu expand"
+    # Logic: If a txt file ALREADY contains the seed word, we assume it's the
+    # right place to put the expansions.
+    # The user asked to "cari kata di semua file txt yang ada gym lalu expand"
     # This implies: Find which file contains 'gym', then add the matches to THAT file.
 
     target_files_updated = []
@@ -89,33 +85,31 @@ def expand_specific_word(seed_word, reference_path, target_dirs):
                     file_path = os.path.join(root, file)
                     
                     try:
+                        # Strict exact match on seed as per instruction "ada gym".
+                        # Most files hold none of the seeds; their Bloom filter
+                        # (when up to date) rules them out without loading them
+                        with FilteredWordlist(file_path) as wl:
+                            found = [seed for seed in matches_by_seed if seed in wl]
+                        if not found:
+                            continue
+
                         current_words = load_wordlist(file_path)
+                        original_count = len(current_words)
+
+                        print(f"Found seed(s) {found} in {file_path}. Adding matches...")
+                        updated_words = set(current_words)
+                        for seed in found:
+                            updated_words.update(matches_by_seed[seed])
+                        added_count = len(updated_words) - original_count
                         
-                        # Check if seed exists in this file
-                        # Or maybe check if ANY of the matches exist? 
-                        # User said: "cari kata di semua file txt yang ada gym"
-                        # So strictly: does 'gym' exist in nouns.txt? yes -> add matches.
-                        
-                        if seed in current_words:
-                            print(f"Found seed '{seed}' in {file_path}. Adding matches...")
-                            
-                            # Add matches
-                            original_count = len(current_words)
-                            updated_words = current_words.union(matches)
-                            added_count = len(updated_words) - original_count
-                            
-                            if added_count > 0:
-                                with open(file_path, 'w', encoding='utf-8') as f:
-                                    for w in sorted(list(updated_words)):
-                                        f.write(w + '\n')
-                                print(f"  -> Added {added_count} new words to {file}.")
-                                target_files_updated.append(file_path)
-                            else:
-                                print(f"  -> All matches already exist in {file}.")
+                        if added_count > 0:
+                            with open(file_path, 'w', encoding='utf-8') as f:
+                                for w in sorted(updated_words):
+                                    f.write(w + '\n')
+                            print(f"  -> Added {added_count} new words to {file}.")
+                            target_files_updated.append(file_path)
                         else:
-                            # Optional: What if 'gym' isn't there but 'gyms' is?
-                            # For now, strict exact match on seed as per instruction "ada gym"
-                            pass
+                            print(f"  -> All matches already exist in {file}.")
 
                     except Exception as e:
                         print(f"Error processing {file_path}: {e}")
@@ -123,31 +117,45 @@ def expand_specific_word(seed_word, reference_path, target_dirs):
     # 4. Trigger Preprocessing for updated files
     if target_files_updated:
         print("\nTriggering preprocessing for updated files...")
-        for txt_path in target_files_updated:
-            json_path = txt_path.replace('.txt', '.json')
-            cmd = f"python tools/preprocess_wordlist.py {txt_path} {json_path}"
-            print(f"Running: {cmd}")
-            os.system(cmd)
+        jobs = [(txt_path, txt_path.replace('.txt', '.json')) for txt_path in target_files_updated]
+        for txt_path, json_path, seconds, result, error in preprocess_many(jobs, incremental=True):
+            if error is not None:
+                print(f"Error preprocessing {txt_path}: {error}")
+            else:
+                print(f"Updated {json_path} in {seconds:.2f}s")
+
+def expand_specific_word(seed_word, reference_path, target_dirs):
+    expand_seeds([seed_word], reference_path, target_dirs)
             
 def main():
-    parser = argparse.ArgumentParser(description="Expand specific seed word across wordlists.")
-    parser.add_argument("seed", nargs="?", help="The word to expand (e.g. 'gym'). If omitted, you will be prompted.")
+    parser = argparse.ArgumentParser(description="Expand seed words across wordlists.")
+    parser.add_argument("seeds", nargs="*", help="Words to expand (e.g. 'gym'). If omitted and no --seeds-file is given, you will be prompted.")
+    parser.add_argument("--seeds-file", help="Text file with one seed word per line (lines starting with # are ignored)")
     parser.add_argument("--reference", default=r"c:\Project\Outside\s6xsense\wordlist\1000000.txt", help="Path to reference txt")
     parser.add_argument("--target_dir", default=r"c:\Project\Outside\s6xsense\wordlist\wordlist", help="Directory containing target wordlists")
     args = parser.parse_args()
     
-    seed = args.seed
-    if not seed:
+    seeds = list(args.seeds)
+    if args.seeds_file:
+        try:
+            seeds.extend(load_seeds_file(args.seeds_file))
+        except FileNotFoundError:
+            print(f"Error: Seeds file not found: {args.seeds_file}")
+            sys.exit(1)
+
+    if not seeds and not args.seeds_file:
         try:
             seed = input("Enter the word to expand: ").strip()
         except KeyboardInterrupt:
             sys.exit(0)
+        if seed:
+            seeds.append(seed)
             
-    if not seed:
+    if not seeds:
         print("No seed word provided. Exiting.")
         sys.exit(1)
     
-    expand_specific_word(seed, args.reference, [args.target_dir])
+    expand_seeds(seeds, args.reference, [args.target_dir])
 
 if __name__ == "__main__":
     main()
@@ -1,27 +1,101 @@
+import argparse
+import json
 import os
 import re
 import glob
 
+# Game servers log failures as: [time] Player: <name> | Word: <word>
+WORD_PATTERN = re.compile(r"Word:\s*(\w+)")
+
+def parse_failed_word(line):
+    """The lowercased failed word on a log line, or None."""
+    match = WORD_PATTERN.search(line)
+    if match:
+        return match.group(1).strip().lower()
+    return None
+
 def extract_words_from_file(input_path):
     print(f"Reading from: {input_path}")
     words = set()
     try:
         with open(input_path, 'r', encoding='utf-8') as f:
             for line in f:
-                # Look for pattern: Word: <word>
-                match = re.search(r"Word:\s*(\w+)", line)
-                if match:
-                    word = match.group(1).strip().lower()
+                word = parse_failed_word(line)
+                if word:
                     words.add(word)
     except FileNotFoundError:
         print(f"Error: Input file not found: {input_path}")
     return words
 
+def load_checkpoint(path):
+    """{log name: {"inode", "size", "offset"}} from a checkpoint file, or {}."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return {name: entry for name, entry in checkpoint.items() if isinstance(entry, dict)}
+
+def save_checkpoint(path, checkpoint):
+    out_dir = os.path.dirname(path)
+    if out_dir and not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def read_appended(path, entry=None):
+    """
+    Failed words appended to the log at `path` since its checkpoint `entry`,
+    and the entry to store once they are handled. A log whose inode changed
+    (rotated) or that got shorter than the offset (truncated) is read from the
+    start. Only complete lines are read: a last line without a newline may
+    still be being written, so the offset stays at its start until it is done.
+    """
+    st = os.stat(path)
+    offset = entry["offset"] if entry else 0
+    if entry and entry.get("inode") != st.st_ino:
+        print(f"{os.path.basename(path)} was rotated, reading it from the start")
+        offset = 0
+    elif st.st_size < offset:
+        print(f"{os.path.basename(path)} was truncated, reading it from the start")
+        offset = 0
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        # Only up to the size we stat'ed, so it matches what the entry records
+        data = f.read(st.st_size - offset)
+    end = data.rfind(b'\n') + 1
+
+    words = []
+    for line in data[:end].decode('utf-8', errors='replace').splitlines():
+        word = parse_failed_word(line)
+        if word:
+            words.append(word)
+    return words, {"inode": st.st_ino, "size": st.st_size, "offset": offset + end}
+
+def append_words(path, words):
+    """Append one word per line to `path`, starting a new line if it lacks a final newline."""
+    with open(path, 'ab') as f:
+        if f.tell():
+            with open(path, 'rb') as last:
+                last.seek(-1, os.SEEK_END)
+                if last.read(1) != b'\n':
+                    f.write(b'\n')
+        f.write(''.join(w + '\n' for w in words).encode('utf-8'))
+
 def main():
-    base_dir = r"c:\Project\Outside\s6xsense\wordlist"
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser = argparse.ArgumentParser(description="Collect the failed words from fail*.txt into fail_filter/fail1_clean.txt.")
+    parser.add_argument("--checkpoint", default=os.path.join(base_dir, '.cache', 'fail_extract_checkpoint.json'),
+                        help="Per-log read positions (default: .cache/fail_extract_checkpoint.json)")
+    parser.add_argument("--full", action="store_true", help="Ignore the checkpoint and read every log from the start")
+    args = parser.parse_args()
+
     output_dir = os.path.join(base_dir, "fail_filter")
     output_file = os.path.join(output_dir, "fail1_clean.txt")
-    
+
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
@@ -36,31 +110,34 @@ def main():
                     all_words.add(w)
 
     # 2. Find all fail*.txt files in the base directory
-    fail_files = glob.glob(os.path.join(base_dir, "fail*.txt"))
-    
+    fail_files = sorted(glob.glob(os.path.join(base_dir, "fail*.txt")))
+
     if not fail_files:
         print("No fail*.txt files found.")
         return
 
     print(f"Found {len(fail_files)} fail files: {[os.path.basename(f) for f in fail_files]}")
 
-    # 3. Extract words from each file
-    new_words_count = 0
+    # 3. Extract the words appended to each file since the last run
+    checkpoint = {} if args.full else load_checkpoint(args.checkpoint)
+    new_words = []
     for file_path in fail_files:
-        words = extract_words_from_file(file_path)
+        name = os.path.basename(file_path)
+        words, checkpoint[name] = read_appended(file_path, checkpoint.get(name))
+        print(f"Read {name}: {len(words)} failed words since the last run")
         for w in words:
             if w not in all_words:
                 all_words.add(w)
-                new_words_count += 1
-    
-    print(f"Found {new_words_count} new unique words.")
+                new_words.append(w)
+
+    print(f"Found {len(new_words)} new unique words.")
 
-    # 4. Write back to single output file
+    # 4. Append the new words; the checkpoint is only saved once they are on disk
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for w in sorted(list(all_words)):
-                f.write(w + '\n')
-        print(f"Successfully wrote {len(all_words)} unique words to: {output_file}")
+        if new_words:
+            append_words(output_file, sorted(new_words))
+            print(f"Appended {len(new_words)} words to: {output_file} ({len(all_words)} total)")
+        save_checkpoint(args.checkpoint, checkpoint)
     except Exception as e:
         print(f"Error writing output: {e}")
 
@@ -1,6 +1,32 @@
+import argparse
+import glob
+import json
 import os
 import sys
-import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from json.decoder import scanstring
+
+# Make the shared modules in tools/ importable when run from tools/fail/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from binary_wordlist import FLAG_POS, BinaryWordlist, write_binary
+from word_filter import FilteredWordlist
+
+# Removes blacklisted words from every category file in one streaming pass per
+# file, with the files spread over a process pool: the txt lists in wordlist/
+# and wordlist_new/, the JSON outputs in wordlist/, preprocessed/ and
+# wordlist_new/json/, and the columnar category table wordlist_new/words.wlb
+# (which generate_freq_json --columnar would otherwise score back into the JSON). Removing a word never changes the scores of the others,
+# so the JSON is patched in place instead of being regenerated.
+#
+# Each worker checks words against the blacklist through its Bloom filter (see
+# word_filter.py) when one is up to date, instead of receiving the whole list
+# as a set; a stale or missing filter falls back to the list itself.
+
+TXT_DIRS = ('wordlist', 'wordlist_new')
+JSON_DIRS = ('wordlist', 'preprocessed', os.path.join('wordlist_new', 'json'))
+WLB_FILES = (os.path.join('wordlist_new', 'words.wlb'),)
 
 def load_blacklist(path):
     blacklist = set()
@@ -14,57 +40,211 @@ def load_blacklist(path):
         print(f"Error: Blacklist file not found: {path}")
     return blacklist
 
-def clean_file(file_path, blacklist):
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        original_count = len(lines)
-        new_lines = []
-        removed_words = []
-
-        for line in lines:
+def open_blacklist(path):
+    """Read-only membership test for the blacklist: its Bloom filter when up to date, else the full list."""
+    return FilteredWordlist(path)
+
+def _finish(tmp_path, path, removed):
+    # Unchanged files keep their mtime, so nothing downstream sees them as edited
+    if removed:
+        os.replace(tmp_path, path)
+    else:
+        os.remove(tmp_path)
+
+def clean_txt(file_path, blacklist):
+    """Drop the lines of a one-word-per-line txt that are blacklisted. Returns the removed words."""
+    removed = []
+    tmp_path = file_path + '.tmp'
+    with open(file_path, 'r', encoding='utf-8', newline='') as src, \
+            open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+        for line in src:
             word = line.strip().lower()
             if word in blacklist:
-                removed_words.append(word)
+                removed.append(word)
             else:
-                new_lines.append(line)
-        
-        if len(new_lines) < original_count:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.writelines(new_lines)
-            print(f"Cleaned {os.path.basename(file_path)}: Removed {len(removed_words)} words ({', '.join(removed_words[:5])}...)")
-            return True
-        return False
+                out.write(line)
+    _finish(tmp_path, file_path, removed)
+    return removed
+
+def drop_json_keys(json_path, words):
+    """Delete `words` from a word -> score JSON in place, keeping its order. Returns the removed words."""
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return []
+    removed = [w for w in data if w in words]
+    if not removed:
+        return []
+    for w in removed:
+        del data[w]
+    tmp_path = json_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, json_path)
+    return removed
+
+def clean_json(json_path, blacklist):
+    """
+    Drop blacklisted keys from a word map written by json.dump(..., indent=2)
+    without parsing it: every top-level entry starts with a '  "key": ' line,
+    and is copied or skipped whole, fixing up the comma after the last entry.
+    Output is identical to reloading and dumping the map. Any other layout
+    goes through drop_json_keys. Returns the removed words.
+    """
+    if not os.path.exists(json_path):
+        return []
+    removed = []
+    tmp_path = json_path + '.tmp'
+    layout_ok = False
+    with open(json_path, 'r', encoding='utf-8', newline='') as src, \
+            open(tmp_path, 'w', encoding='utf-8', newline='') as out:
+        first = src.readline()
+        if first.rstrip('\r\n') == '{' and first != '{':
+            entry = None    # lines of the entry being read
+            drop = False
+            kept = None     # last kept entry, written once we know whether it is the last
+            for line in src:
+                if line.startswith('  "') or line.startswith('}'):
+                    if entry is not None:
+                        if drop:
+                            removed.append(key)
+                        else:
+                            if kept is not None:
+                                out.write(''.join(kept))
+                            else:
+                                out.write(first)
+                            kept = entry
+                    if line.startswith('}'):
+                        if kept is None:
+                            # Every entry went: json.dump writes an empty map as {}
+                            out.write('{' + line)
+                        else:
+                            last = kept[-1]
+                            body = last.rstrip('\r\n')
+                            if body.endswith(','):
+                                kept[-1] = body[:-1] + last[len(body):]
+                            out.write(''.join(kept) + line)
+                        out.write(src.read())
+                        layout_ok = True
+                        break
+                    try:
+                        key = scanstring(line, 3)[0]
+                    except ValueError:
+                        break
+                    entry = [line]
+                    drop = key in blacklist
+                elif entry is not None:
+                    entry.append(line)
+                else:
+                    break
+    if not layout_ok:
+        os.remove(tmp_path)
+        return drop_json_keys(json_path, blacklist)
+    _finish(tmp_path, json_path, removed)
+    return removed
+
+def clean_wlb(wlb_path, blacklist):
+    """Drop the blacklisted rows of a binary wordlist, keeping every column of the rest. Returns the removed words."""
+    with BinaryWordlist(wlb_path) as wl:
+        removed = [w for w in wl if w in blacklist]
+        if not removed:
+            return []
+        has_pos = wl.flags & FLAG_POS
+        drop = set(removed)
+        rows = [(w,) + wl.scores_at(i) + (wl.pos_at(i) if has_pos else None,)
+                for i, w in enumerate(wl) if w not in drop]
+    write_binary(wlb_path, rows)
+    return removed
+
+def clean_file(file_path, blacklist):
+    """Remove blacklisted words from a txt list, a JSON map or a binary wordlist. Returns the removed words."""
+    if file_path.endswith('.json'):
+        return clean_json(file_path, blacklist)
+    if file_path.endswith('.wlb'):
+        return clean_wlb(file_path, blacklist)
+    return clean_txt(file_path, blacklist)
+
+def category_files(base_dir):
+    paths = []
+    for d in TXT_DIRS:
+        paths.extend(sorted(glob.glob(os.path.join(base_dir, d, '*.txt'))))
+    for d in JSON_DIRS:
+        paths.extend(sorted(glob.glob(os.path.join(base_dir, d, '*.json'))))
+    paths.extend(p for p in (os.path.join(base_dir, f) for f in WLB_FILES) if os.path.exists(p))
+    return paths
+
+_blacklist = None
+
+def _init_worker(blacklist_path):
+    global _blacklist
+    _blacklist = open_blacklist(blacklist_path)
+
+def _clean_job(path):
+    start = time.perf_counter()
+    removed = []
+    error = None
+    try:
+        removed = clean_file(path, _blacklist)
     except Exception as e:
-        print(f"Error processing {file_path}: {e}")
-        return False
+        # One bad file should not stop the others
+        error = e
+    return path, removed, time.perf_counter() - start, error
+
+def remove_blacklisted(paths, blacklist_path, workers=0):
+    """
+    Clean every file in `paths` of the words in the blacklist at `blacklist_path`,
+    in this process (workers=1) or across a pool (0 = all cores).
+    Returns (path, removed words, seconds, error) in path order.
+    """
+    if not paths:
+        return []
+    if workers == 1:
+        _init_worker(blacklist_path)
+        return [_clean_job(p) for p in paths]
+    # Largest files first, so one big file does not start last
+    order = sorted(paths, key=os.path.getsize, reverse=True)
+    max_workers = min(workers or os.cpu_count() or 1, len(paths))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(blacklist_path,)) as executor:
+        results = {r[0]: r for r in executor.map(_clean_job, order)}
+    return [results[p] for p in paths]
 
 def main():
     # Go up 3 levels: tools/fail/remove_failed_words.py -> tools/fail -> tools -> root
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    blacklist_path = os.path.join(base_dir, 'fail_filter', 'fail1_clean.txt')
-    wordlist_dir = os.path.join(base_dir, 'wordlist')
-    preprocess_script = os.path.join(base_dir, 'tools', 'preprocess_all.py')
+    parser = argparse.ArgumentParser(description="Remove the blacklisted words from every wordlist txt, JSON output and the columnar table.")
+    parser.add_argument("--blacklist", default=os.path.join(base_dir, 'fail_filter', 'fail1_clean.txt'),
+                        help="Words to remove (default: fail_filter/fail1_clean.txt)")
+    parser.add_argument("--workers", type=int, default=0, help="Number of processes (default: 0 = all cores, 1 = in this process)")
+    args = parser.parse_args()
 
-    print(f"Loading blacklist from {blacklist_path}...")
-    blacklist = load_blacklist(blacklist_path)
-    if not blacklist:
+    print(f"Loading blacklist from {args.blacklist}...")
+    try:
+        with open_blacklist(args.blacklist) as blacklist:
+            count, filtered = len(blacklist), blacklist.filtered
+    except FileNotFoundError:
+        count, filtered = 0, False
+    if not count:
         print("Blacklist is empty or not found. Exiting.")
         return
-    
-    print(f"Loaded {len(blacklist)} words to remove.")
-
-    files_updated = False
-    for filename in os.listdir(wordlist_dir):
-        if filename.endswith(".txt"):
-            file_path = os.path.join(wordlist_dir, filename)
-            if clean_file(file_path, blacklist):
-                files_updated = True
-    
-    if files_updated:
-        print("\nSome files were modified. Updating JSON files...")
-        subprocess.run([sys.executable, preprocess_script], check=True)
+
+    how = "through its Bloom filter" if filtered else "from the list (no up-to-date filter; see word_filter.py build)"
+    print(f"Loaded {count} words to remove, checked {how}.")
+
+    start = time.perf_counter()
+    results = remove_blacklisted(category_files(base_dir), args.blacklist, workers=args.workers)
+    total = 0
+    for path, removed, seconds, error in results:
+        name = os.path.relpath(path, base_dir)
+        if error is not None:
+            print(f"Error processing {name}: {error}")
+            continue
+        total += len(removed)
+        sample = f" ({', '.join(removed[:5])}{'...' if len(removed) > 5 else ''})" if removed else ""
+        print(f"{name:<40} {len(removed):>6} removed in {seconds:.2f}s{sample}")
+
+    if total:
+        print(f"\nRemoved {total} entries from {sum(1 for r in results if r[1])} files in {time.perf_counter() - start:.2f}s")
     else:
         print("\nNo words from the blacklist were found in the wordlists.")
 
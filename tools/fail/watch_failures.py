@@ -0,0 +1,126 @@
+import argparse
+import glob
+import os
+import time
+
+from extract_failed_words import append_words, load_checkpoint, read_appended, save_checkpoint
+from remove_failed_words import clean_file, load_blacklist
+
+# Daemon mode for process_failures: follows the fail*.txt logs the game servers
+# append to, and removes newly failed words from wordlist/ within seconds.
+#
+# Each log is read from the checkpointed byte offset where the previous poll
+# stopped (see extract_failed_words.read_appended for rotation and truncation). New words are collected for --window
+# seconds, then applied in one go: appended to fail_filter/fail1_clean.txt,
+# removed from the wordlist txt files that contain them, and deleted from the
+# matching JSON (removals never change the remaining scores, so nothing is
+# rescored). The checkpoint is saved after each batch is applied, so a crash only
+# replays lines whose words are then already blacklisted.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Separate from extract_failed_words' checkpoint: lines that run consumed were
+# blacklisted but not removed from the wordlists yet
+DEFAULT_CHECKPOINT_PATH = os.path.join(BASE_DIR, '.cache', 'fail_watch_checkpoint.json')
+
+
+class WordlistIndex:
+    """word -> wordlist txt files containing it, reloading only files that changed on disk."""
+
+    def __init__(self, wordlist_dir):
+        self.wordlist_dir = wordlist_dir
+        self.files = {}
+        self.stamps = {}
+        self.refresh()
+
+    def refresh(self):
+        paths = set(glob.glob(os.path.join(self.wordlist_dir, '*.txt')))
+        for path in set(self.files) - paths:
+            del self.files[path]
+            del self.stamps[path]
+        for path in paths:
+            st = os.stat(path)
+            stamp = (st.st_size, st.st_mtime_ns)
+            if self.stamps.get(path) != stamp:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.files[path] = {line.strip().lower() for line in f}
+                self.stamps[path] = stamp
+
+    def files_containing(self, words):
+        return {path: words & file_words for path, file_words in self.files.items() if words & file_words}
+
+
+def apply_batch(words, blacklist, blacklist_path, index):
+    new_words = sorted(words - blacklist)
+    if new_words:
+        append_words(blacklist_path, new_words)
+        blacklist.update(new_words)
+
+    index.refresh()
+    removed = 0
+    for txt_path, found in sorted(index.files_containing(words).items()):
+        clean_file(txt_path, found)
+        dropped = clean_file(os.path.splitext(txt_path)[0] + '.json', found)
+        print(f"Cleaned {os.path.basename(txt_path)}: removed {', '.join(sorted(found))} ({len(dropped)} from the JSON)")
+        removed += len(dropped)
+    # Our own rewrites would otherwise look like outside edits next time
+    index.refresh()
+    return len(new_words), removed
+
+
+def watch(log_pattern, blacklist_path, wordlist_dir, checkpoint_path, window=2.0, poll=0.5, once=False):
+    checkpoint = load_checkpoint(checkpoint_path)
+    blacklist = load_blacklist(blacklist_path) if os.path.exists(blacklist_path) else set()
+    index = WordlistIndex(wordlist_dir)
+    print(f"Watching {log_pattern} ({len(blacklist)} words blacklisted, {len(index.files)} wordlists)")
+
+    pending = set()
+    first_seen = None
+    unsaved = False
+    while True:
+        for path in sorted(glob.glob(log_pattern)):
+            name = os.path.basename(path)
+            previous = checkpoint.get(name)
+            words, checkpoint[name] = read_appended(path, previous)
+            unsaved = unsaved or checkpoint[name] != previous
+            if words:
+                pending.update(words)
+                if first_seen is None:
+                    first_seen = time.monotonic()
+
+        if pending and (once or time.monotonic() - first_seen >= window):
+            added, removed = apply_batch(pending, blacklist, blacklist_path, index)
+            save_checkpoint(checkpoint_path, checkpoint)
+            unsaved = False
+            print(f"Applied {len(pending)} failed words: {added} new, {removed} JSON entries removed, "
+                  f"{time.monotonic() - first_seen:.1f}s after the first was seen")
+            pending = set()
+            first_seen = None
+        elif unsaved and not pending:
+            # Lines without a failed word still move the checkpoint on
+            save_checkpoint(checkpoint_path, checkpoint)
+            unsaved = False
+
+        if once and not pending:
+            return
+        time.sleep(poll)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tail the failure logs and remove failed words from the wordlists as they come in.")
+    parser.add_argument("--logs", default=os.path.join(BASE_DIR, 'fail*.txt'), help="Glob of failure logs (default: fail*.txt in the project root)")
+    parser.add_argument("--window", type=float, default=2.0, help="Seconds to batch new words before applying them (default: 2)")
+    parser.add_argument("--poll", type=float, default=0.5, help="Seconds between log polls (default: 0.5)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH, help="Per-log read positions (default: .cache/fail_watch_checkpoint.json)")
+    parser.add_argument("--once", action="store_true", help="Apply whatever is new once and exit")
+    args = parser.parse_args()
+
+    blacklist_path = os.path.join(BASE_DIR, 'fail_filter', 'fail1_clean.txt')
+    wordlist_dir = os.path.join(BASE_DIR, 'wordlist')
+    try:
+        watch(args.logs, blacklist_path, wordlist_dir, args.checkpoint, window=args.window, poll=args.poll, once=args.once)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import os
+import re
+import time
+from importlib.metadata import PackageNotFoundError, version
+
+try:
+    from wordfreq import get_frequency_dict, zipf_frequency
+except Exception:
+    get_frequency_dict = None
+    zipf_frequency = None
+
+from binary_wordlist import BinaryWordlist, write_binary
+from score_cache import DEFAULT_CACHE_PATH
+
+# Local dump of the wordfreq table as a sorted, mmapped .wlb file whose freq
+# column holds the exact zipf_frequency() value of every entry. Scoring tools
+# look whole batches up with one merge join instead of calling zipf_frequency
+# word by word.
+#
+# A plain a-z word is a single wordfreq token, so when it is not in the table
+# its zipf is 0.0, exactly what zipf_frequency returns. Anything else (digits,
+# apostrophes, ...) still goes through zipf_frequency.
+
+DEFAULT_TABLE_DIR = os.path.dirname(DEFAULT_CACHE_PATH)
+
+_PLAIN_RE = re.compile(r"[a-z]+")
+
+# Open tables per language, built on first use
+_tables = {}
+
+
+def wordfreq_version():
+    try:
+        return version('wordfreq')
+    except PackageNotFoundError:
+        return None
+
+
+def table_path(lang="en", table_dir=DEFAULT_TABLE_DIR):
+    # A table is only valid for the wordfreq release it was dumped from
+    return os.path.join(table_dir, f"zipf-{lang}-{wordfreq_version()}.wlb")
+
+
+def export_freq_table(lang="en", path=None):
+    path = path or table_path(lang)
+    out_dir = os.path.dirname(path)
+    if out_dir and not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+    start = time.perf_counter()
+    freqs = get_frequency_dict(lang)
+    count = write_binary(path, ((w, zipf_frequency(w, lang), None) for w in freqs))
+    print(f"Exported {count} '{lang}' frequencies to {path} ({time.perf_counter() - start:.1f}s)")
+    return path
+
+
+class FreqTable:
+    def __init__(self, path, lang="en"):
+        self.lang = lang
+        self.wl = BinaryWordlist(path)
+        self._zipf = None
+
+    def close(self):
+        self.wl.close()
+
+    def _fallback(self, word):
+        if _PLAIN_RE.fullmatch(word):
+            return 0.0
+        try:
+            return float(zipf_frequency(word, self.lang))
+        except Exception:
+            return 0.0
+
+    def zipf(self, word):
+        scores = self.wl.get(word)
+        return scores[0] if scores is not None else self._fallback(word)
+
+    def zipf_many(self, words):
+        """{word: zipf} for every word, via one merge join against the table."""
+        if self._zipf is None:
+            # The whole column as floats: cheaper than decoding hits one by one
+            self._zipf = [self.wl.scores_at(i)[0] for i in range(len(self.wl))]
+        column = self._zipf
+        found = self.wl.positions(words)
+        result = {}
+        for w in words:
+            i = found.get(w)
+            result[w] = column[i] if i is not None else self._fallback(w)
+        return result
+
+
+def get_freq_table(lang="en", build=True):
+    """The open table for `lang`, dumping it first if needed; None without wordfreq."""
+    table = _tables.get(lang)
+    if table is not None:
+        return table
+    if get_frequency_dict is None:
+        return None
+    path = table_path(lang)
+    if not os.path.exists(path):
+        if not build:
+            return None
+        export_freq_table(lang, path)
+    table = _tables[lang] = FreqTable(path, lang)
+    return table
+
+
+def bulk_zipf(words, lang="en"):
+    """{word: zipf_frequency(word, lang)} for a batch of words."""
+    table = get_freq_table(lang)
+    if table is None:
+        return {w: 0.0 for w in words}
+    return table.zipf_many(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dump the wordfreq table to a local sorted .wlb file used for bulk zipf lookups.")
+    parser.add_argument("--lang", action="append", help="Language code; repeatable (default: en)")
+    parser.add_argument("--out", help="Output path (default: .cache/zipf-<lang>-<wordfreq version>.wlb)")
+    args = parser.parse_args()
+
+    if get_frequency_dict is None:
+        print("ERROR: 'wordfreq' library not available. Install with: python -m pip install wordfreq")
+        return
+    for lang in args.lang or ["en"]:
+        export_freq_table(lang, args.out if args.out and len(args.lang or ["en"]) == 1 else None)
+
+
+if __name__ == "__main__":
+    main()
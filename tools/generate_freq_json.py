@@ -1,49 +1,145 @@
 import os
 import json
 import math
-from collections import defaultdict
-from wordfreq import zipf_frequency
+import argparse
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import nltk
 from nltk.stem import WordNetLemmatizer
-from nltk.corpus import wordnet
+from binary_wordlist import BinaryWordlist, write_binary
+from classify_words import CATEGORY_BITS, CATEGORY_FILES, COLUMNAR_FILE
+from freq_table import bulk_zipf, get_freq_table, wordfreq_version
+from json_stream import write_json_map
+from likeness_models import NGRAM_MODELS, KneserNeyScorer, LikenessScorer, train_ngram_scorer
+from score_cache import DEFAULT_CACHE_PATH, ScoreCache, file_hash, model_hash
+from wordnet_index import ADJ, ADV, NOUN, VERB, get_pos_index
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Bump when get_boosted_freq or calculate_likeness change, to invalidate cached rows
+SCORER_VERSION = "boosted-v1"
 
 # Global Bigram Model
 bigram_probs = {}
 min_log_prob = -10.0
 
+# Same model as a 28x28 log-probability matrix over ^, a-z, $ (rows = first char),
+# used to score whole batches with NumPy. None when NumPy is unavailable.
+ALPHABET = "^abcdefghijklmnopqrstuvwxyz$"
+bigram_matrix = None
+if np is not None:
+    # Byte value -> alphabet index; other bytes never reach the lookup
+    _CHAR_INDEX = np.zeros(256, dtype=np.intp)
+    for _i, _c in enumerate(ALPHABET):
+        _CHAR_INDEX[ord(_c)] = _i
+    _PLAIN_BYTE = np.zeros(256, dtype=bool)
+    _PLAIN_BYTE[ord('a'):ord('z') + 1] = True
+
+# Average log prob per transition mapped to the 0-100 likeness scale
+LIKE_LOWER_BOUND = -7.0
+LIKE_UPPER_BOUND = -1.5
+
+# Only "common" reference words (zipf >= this) are used to train the likeness models
+TRAIN_MIN_ZIPF = 4.0
+
+# Trained models are saved here as <model>.model.json and reused while the
+# reference file and training parameters are unchanged
+DEFAULT_MODEL_DIR = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), 'models')
+MODEL_FORMAT = 1
+
+# Higher-order likeness model selected with --model; None means the bigram model above
+likeness_scorer = None
+
 # Initialize Lemmatizer
 lemmatizer = WordNetLemmatizer()
 
-def train_bigram_model(reference_file):
-    print("Training bigram model for word-likeness...")
-    global bigram_probs, min_log_prob
-    
-    counts = defaultdict(int)
-    total_counts = defaultdict(int)
-    
+# Words scoring at or below this get the lemma / suffix-root boost
+BOOST_THRESHOLD = 5.0
+
+# Manual Suffix Stripping (Aggressive Heuristic)
+# NLTK lemmatizer sometimes fails on simple suffix removal if POS tag isn't perfect
+# or word is rare. We manually strip common suffixes to find a root candidate.
+ROOT_SUFFIXES = (
+    ('ing', ''), ('ing', 'e'),  # running -> run, making -> make
+    ('ed', ''), ('ed', 'e'),    # played -> play, liked -> like
+    ('s', ''),                  # cats -> cat
+    ('es', ''),                 # boxes -> box
+    ('er', ''), ('er', 'e'),    # player -> play, nicer -> nice
+    ('est', ''), ('est', 'e'),  # fastest -> fast
+    ('ly', ''),                 # quickly -> quick
+    ('ment', ''),               # amazement -> amaze
+    ('ness', ''),               # darkness -> dark
+    ('able', ''), ('able', 'e') # lovable -> love
+)
+
+# Lemmatizer POS for each classify_words category; the others are not lemmatized
+CATEGORY_POS = {'nouns': NOUN, 'verbs': VERB, 'adjectives': ADJ, 'adverbs': ADV}
+
+# Bounds for the memoised zipf / lemma lookups (per process)
+FREQ_CACHE_SIZE = 1 << 18
+LEMMA_CACHE_SIZE = 1 << 16
+
+def load_training_words(reference_file):
+    """Common reference words used to train the likeness models, or None if the file is missing."""
+    candidates = []
     try:
         with open(reference_file, 'r', encoding='utf-8') as f:
             for line in f:
                 word = line.strip().lower()
                 if not word: continue
-                
-                # Only use "common" words for training the model to capture "good" English patterns
-                # Zipf > 4.0 (approx > 50% on our scale) is a good threshold for common words
-                z = zipf_frequency(word, 'en')
-                if z < 4.0:
-                    continue
-                
-                # Add start/end tokens
-                padded = "^" + word + "$"
-                for i in range(len(padded) - 1):
-                    bg = padded[i:i+2]
-                    counts[bg] += 1
-                    total_counts[padded[i]] += 1
-                    
+                candidates.append(word)
     except FileNotFoundError:
+        return None
+
+    # Only use "common" words for training the model to capture "good" English patterns
+    # Zipf > 4.0 (approx > 50% on our scale) is a good threshold for common words
+    zipfs = bulk_zipf(candidates, 'en')
+    return [w for w in candidates if zipfs[w] >= TRAIN_MIN_ZIPF]
+
+def train_bigram_model(reference_file, words=None):
+    print("Training bigram model for word-likeness...")
+    global bigram_probs, min_log_prob
+    
+    if words is None:
+        words = load_training_words(reference_file)
+    if words is None:
         print("Reference file not found. Skipping bigram training.")
         return
 
+    counts = defaultdict(int)
+    total_counts = defaultdict(int)
+    training_words = []
+    
+    for word in words:
+        if np is not None and _is_plain_word(word):
+            training_words.append(word)
+            continue
+
+        # Add start/end tokens
+        padded = "^" + word + "$"
+        for i in range(len(padded) - 1):
+            bg = padded[i:i+2]
+            counts[bg] += 1
+            total_counts[padded[i]] += 1
+
+    if training_words:
+        # Count all transitions at once: "^w1$^w2$..." as index pairs, skipping the
+        # "$^" pairs that join one padded word to the next
+        joined = ("^" + "$^".join(training_words) + "$").encode('ascii')
+        idx = _CHAR_INDEX[np.frombuffer(joined, dtype=np.uint8)]
+        first, second = idx[:-1], idx[1:]
+        keep = first != len(ALPHABET) - 1
+        pair_counts = np.bincount(first[keep] * len(ALPHABET) + second[keep], minlength=len(ALPHABET) ** 2)
+        for pair in np.nonzero(pair_counts)[0]:
+            a, b = divmod(int(pair), len(ALPHABET))
+            counts[ALPHABET[a] + ALPHABET[b]] += int(pair_counts[pair])
+            total_counts[ALPHABET[a]] += int(pair_counts[pair])
+
     # Calculate probabilities
     bigram_probs = {}
     for bg, count in counts.items():
@@ -53,9 +149,131 @@ def train_bigram_model(reference_file):
     
     # Define a minimum probability for unseen bigrams
     min_log_prob = -15.0 
+    build_bigram_matrix()
     print(f"Bigram model trained. {len(bigram_probs)} bigrams learned.")
 
+class BigramScorer(LikenessScorer):
+    """The built-in bigram model (module globals) behind the LikenessScorer interface."""
+    name = "bigram"
+    lower_bound = LIKE_LOWER_BOUND
+    upper_bound = LIKE_UPPER_BOUND
+
+    def avg_log_prob(self, word):
+        # The same transitions, in the same order, as calculate_likeness
+        padded = "^" + word + "$"
+        if bigram_matrix is not None and _is_plain_word(word):
+            idx = [ALPHABET.index(c) for c in padded]
+            log_probs = bigram_matrix[idx[:-1], idx[1:]].tolist()
+        else:
+            log_probs = [bigram_probs.get(padded[i:i + 2], min_log_prob) for i in range(len(padded) - 1)]
+        log_sum = 0
+        for lp in log_probs:
+            log_sum += lp
+        return log_sum / (len(padded) - 1)
+
+    def score(self, word):
+        return calculate_likeness(word)
+
+    def score_batch(self, words):
+        return calculate_likeness_batch(words)
+
+def get_likeness_scorer():
+    return likeness_scorer if likeness_scorer is not None else BigramScorer()
+
+def train_likeness_model(name, reference_file):
+    """Train the bigram model, or a higher-order model from likeness_models by name."""
+    global likeness_scorer
+    if name == "bigram":
+        likeness_scorer = None
+        train_bigram_model(reference_file)
+        return
+    print(f"Training {name} model for word-likeness...")
+    words = load_training_words(reference_file)
+    if words is None:
+        print("Reference file not found. Skipping likeness training.")
+        likeness_scorer = None
+        return
+    likeness_scorer = train_ngram_scorer(name, words)
+    print(f"{name} model trained. {len(likeness_scorer.log_probs)} n-grams learned.")
+
+def model_artifact_key(name, reference_file):
+    """Everything the trained model depends on; a different key means retrain."""
+    return {
+        "format": MODEL_FORMAT,
+        "model": name,
+        "reference_sha1": file_hash(reference_file),
+        "min_zipf": TRAIN_MIN_ZIPF,
+        # The training filter uses zipf_frequency, whose data ships with wordfreq
+        "wordfreq": wordfreq_version(),
+    }
+
+def save_model_artifact(path, key):
+    if likeness_scorer is not None:
+        model = likeness_scorer.to_dict()
+    else:
+        model = {"bigram_probs": bigram_probs, "min_log_prob": min_log_prob}
+    model_dir = os.path.dirname(path)
+    if model_dir and not os.path.exists(model_dir):
+        os.makedirs(model_dir)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"key": key, "model": model}, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def load_model_artifact(path, key):
+    """Install the saved model if its key matches; returns False when it must be retrained."""
+    global bigram_probs, min_log_prob, likeness_scorer
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            artifact = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if artifact.get("key") != key:
+        return False
+    model = artifact["model"]
+    if key["model"] == "bigram":
+        likeness_scorer = None
+        bigram_probs = model["bigram_probs"]
+        min_log_prob = model["min_log_prob"]
+        build_bigram_matrix()
+    else:
+        likeness_scorer = KneserNeyScorer.from_dict(model)
+    return True
+
+def load_or_train_likeness_model(name, reference_file, model_dir=DEFAULT_MODEL_DIR, retrain=False):
+    """Load the saved model for `name` when it is up to date, otherwise train and save it."""
+    if not os.path.exists(reference_file):
+        train_likeness_model(name, reference_file)
+        return
+    path = os.path.join(model_dir, f"{name}.model.json")
+    key = model_artifact_key(name, reference_file)
+    start = time.perf_counter()
+    if not retrain and load_model_artifact(path, key):
+        print(f"Loaded {name} model from {path} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        return
+    train_likeness_model(name, reference_file)
+    save_model_artifact(path, key)
+    print(f"Saved {name} model to {path}")
+
+def _is_plain_word(word):
+    # Only a-z words can be encoded into the matrix alphabet
+    return word.isascii() and word.isalpha() and word.islower()
+
+def build_bigram_matrix():
+    global bigram_matrix
+    if np is None or not bigram_probs:
+        bigram_matrix = None
+        return
+    matrix = np.full((len(ALPHABET), len(ALPHABET)), min_log_prob, dtype=np.float64)
+    for bg, log_prob in bigram_probs.items():
+        a, b = ALPHABET.find(bg[0]), ALPHABET.find(bg[1])
+        if a >= 0 and b >= 0:
+            matrix[a, b] = log_prob
+    bigram_matrix = matrix
+
 def calculate_likeness(word):
+    if likeness_scorer is not None:
+        return likeness_scorer.score(word)
     if not bigram_probs:
         return 0.0
         
@@ -78,8 +296,8 @@ def calculate_likeness(word):
     # Best avg log prob seen in English is usually around -2.0 to -2.5
     # Worst (random strings) is around -10 or lower.
     
-    lower_bound = -7.0
-    upper_bound = -1.5
+    lower_bound = LIKE_LOWER_BOUND
+    upper_bound = LIKE_UPPER_BOUND
     
     score = (avg_log_prob - lower_bound) / (upper_bound - lower_bound) * 100
     
@@ -88,60 +306,184 @@ def calculate_likeness(word):
     
     return round(score, 2)
 
-def get_freq_score(word):
-    z_score = zipf_frequency(word, 'en')
+def calculate_likeness_batch(words):
+    """
+    calculate_likeness for a whole list at once. Words of equal length are encoded
+    into one index array and their transitions summed column by column, in the
+    same order as the scalar loop, so the scores are identical.
+    """
+    if likeness_scorer is not None:
+        return likeness_scorer.score_batch(words)
+    if not bigram_probs:
+        return [0.0] * len(words)
+    if bigram_matrix is None:
+        return [calculate_likeness(w) for w in words]
+
+    results = [None] * len(words)
+    lengths = np.fromiter(map(len, words), dtype=np.intp, count=len(words))
+    order = np.argsort(lengths, kind='stable')
+    bounds = np.flatnonzero(np.diff(lengths[order])) + 1
+    for group in np.split(order, bounds):
+        if not len(group):
+            continue
+        positions = group.tolist()
+        length = int(lengths[group[0]])
+        group_words = [words[i] for i in positions]
+        try:
+            joined = ("^" + "$^".join(group_words) + "$").encode('ascii')
+            raw = np.frombuffer(joined, dtype=np.uint8).reshape(len(positions), length + 2)
+            plain = _PLAIN_BYTE[raw[:, 1:-1]].all(axis=1) if length else np.zeros(len(positions), dtype=bool)
+        except UnicodeEncodeError:
+            plain = None
+        if plain is None or not plain.all():
+            # Anything outside a-z goes through the scalar path
+            if plain is None:
+                plain = np.array([_is_plain_word(w) for w in group_words], dtype=bool)
+            for i, ok in zip(positions, plain.tolist()):
+                if not ok:
+                    results[i] = calculate_likeness(words[i])
+            positions = [i for i, ok in zip(positions, plain.tolist()) if ok]
+            if not positions:
+                continue
+            raw = np.frombuffer(("^" + "$^".join(words[i] for i in positions) + "$").encode('ascii'),
+                                dtype=np.uint8).reshape(len(positions), length + 2)
+
+        idx = _CHAR_INDEX[raw]
+        log_sum = np.zeros(len(positions), dtype=np.float64)
+        for j in range(length + 1):
+            log_sum += bigram_matrix[idx[:, j], idx[:, j + 1]]
+        avg_log_prob = log_sum / (length + 1)
+        scores = (avg_log_prob - LIKE_LOWER_BOUND) / (LIKE_UPPER_BOUND - LIKE_LOWER_BOUND) * 100
+        # Same clamping as the scalar path (comparisons, not np.clip, so -0.0 is kept as-is)
+        scores = np.where(scores < 0, 0.0, scores)
+        scores = np.where(scores > 100, 100.0, scores)
+        for i, score in zip(positions, _round2(scores)):
+            results[i] = score
+    return results
+
+def _round2(values):
+    """
+    round(v, 2) for an array of floats in [0, 100], matching Python's correctly
+    rounded result: rint(v * 100) / 100 is exact unless v * 100 sits within float
+    error of a .5 tie, and only those few values go through round().
+    """
+    scaled = values * 100
+    rounded = (np.rint(scaled) / 100).tolist()
+    near_tie = np.flatnonzero(np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6)
+    for k in near_tie.tolist():
+        rounded[k] = round(float(values[k]), 2)
+    return rounded
+
+def freq_score_from_zipf(z_score):
     score = round((z_score / 8.0) * 100, 2)
     if score > 100: score = 100.0
     return score
 
-def get_boosted_freq(word, pos_tag=None):
-    # 1. Base Score
-    score = get_freq_score(word)
-    
-    # If score is already decent (>5.0), keep it.
-    if score > 5.0:
-        return score
-        
-    # 2. Try Lemmatization boost (Standard NLTK)
+def get_freq_score(word):
+    table = get_freq_table('en')
+    if table is None:
+        # No wordfreq: same 0.0 fallback as bulk_zipf
+        return 0.0
+    return freq_score_from_zipf(table.zipf(word))
+
+@lru_cache(maxsize=FREQ_CACHE_SIZE)
+def cached_freq_score(word):
+    # The same roots come up for thousands of words, and across category files
+    return get_freq_score(word)
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def cached_lemma(word, pos_tag):
+    index = get_pos_index()
+    if index is not None:
+        return index.lemmatize(word, pos_tag)
+    try:
+        return lemmatizer.lemmatize(word, pos_tag)
+    except Exception:
+        return word
+
+def _pos_tags(pos_tag):
+    # One WordNet POS, or a tuple of them for multi-label words
+    return (pos_tag,) if isinstance(pos_tag, str) else pos_tag or ()
+
+def batch_lemmas(words, pos_tag=None):
+    """{tag: {word: lemma}} for a batch, with one index join per tag when the POS index is available."""
+    index = get_pos_index() if pos_tag else None
+    lemmas = {}
+    for tag in _pos_tags(pos_tag):
+        if index is not None:
+            lemmas[tag] = index.lemmatize_many(words, tag)
+        else:
+            lemmas[tag] = {w: cached_lemma(w, tag) for w in words}
+    return lemmas
+
+def root_candidates(word, pos_tag=None, lemmas=None):
+    """
+    Lemma and suffix-stripped roots that may lend `word` their frequency.
+    `pos_tag` is one WordNet POS, or a tuple of them for multi-label words;
+    `lemmas` are precomputed batch_lemmas.
+    """
     potential_roots = set()
     
-    if pos_tag:
-        try:
-            lemma = lemmatizer.lemmatize(word, pos_tag)
-            if lemma != word:
-                potential_roots.add(lemma)
-        except Exception:
-            pass
-            
-    # 3. Manual Suffix Stripping (Aggressive Heuristic)
-    # NLTK lemmatizer sometimes fails on simple suffix removal if POS tag isn't perfect
-    # or word is rare. We manually strip common suffixes to find a root candidate.
-    
-    suffixes = [
-        ('ing', ''), ('ing', 'e'),  # running -> run, making -> make
-        ('ed', ''), ('ed', 'e'),    # played -> play, liked -> like
-        ('s', ''),                  # cats -> cat
-        ('es', ''),                 # boxes -> box
-        ('er', ''), ('er', 'e'),    # player -> play, nicer -> nice
-        ('est', ''), ('est', 'e'),  # fastest -> fast
-        ('ly', ''),                 # quickly -> quick
-        ('ment', ''),               # amazement -> amaze
-        ('ness', ''),               # darkness -> dark
-        ('able', ''), ('able', 'e') # lovable -> love
-    ]
-    
-    for suffix, replacement in suffixes:
+    for tag in _pos_tags(pos_tag):
+        lemma = lemmas[tag][word] if lemmas is not None else cached_lemma(word, tag)
+        if lemma != word:
+            potential_roots.add(lemma)
+    
+    for suffix, replacement in ROOT_SUFFIXES:
         if word.endswith(suffix):
             root_candidate = word[:-len(suffix)] + replacement
             if len(root_candidate) > 2: # Avoid tiny roots like 'd' from 'doing'
                 potential_roots.add(root_candidate)
+    return potential_roots
+
+def build_root_table(words, pos_tag=None):
+    """
+    {root: freq score} for every root candidate of the low-frequency words in a
+    batch, so words sharing a stem reuse one lookup. Also returns the base
+    scores and each low-frequency word's candidates.
+    """
+    # Words, lemmas and roots are each looked up with one join against their table
+    zipfs = bulk_zipf(words, 'en')
+    base_scores = {word: freq_score_from_zipf(zipfs[word]) for word in words}
+    low = [word for word in words if base_scores[word] <= BOOST_THRESHOLD]
+    lemmas = batch_lemmas(low, pos_tag)
+    candidates = {}
+    roots = set()
+    for word in low:
+        candidates[word] = root_candidates(word, pos_tag, lemmas)
+        roots.update(candidates[word])
+    root_zipfs = bulk_zipf(roots, 'en')
+    return base_scores, {root: freq_score_from_zipf(z) for root, z in root_zipfs.items()}, candidates
+
+def memo_stats():
+    parts = []
+    for name, fn in (("freq", cached_freq_score), ("lemma", cached_lemma)):
+        info = fn.cache_info()
+        if info.hits or info.misses:
+            parts.append(f"{name} memo {info.hits} hits / {info.misses} misses ({info.currsize} cached)")
+    return ", ".join(parts)
+
+def get_boosted_freq(word, pos_tag=None, root_scores=None, score=None, roots=None):
+    # 1. Base Score
+    if score is None:
+        score = cached_freq_score(word)
+    
+    # If score is already decent (>5.0), keep it.
+    if score > BOOST_THRESHOLD:
+        return score
+        
+    # 2. Try Lemmatization boost (Standard NLTK) and 3. suffix-stripped roots
+    potential_roots = roots if roots is not None else root_candidates(word, pos_tag)
                 
     # Check all potential roots
     max_root_score = 0.0
     best_root = None
     
     for root in potential_roots:
-        root_score = get_freq_score(root)
+        if root_scores is not None and root in root_scores:
+            root_score = root_scores[root]
+        else:
+            root_score = cached_freq_score(root)
         if root_score > max_root_score:
             max_root_score = root_score
             best_root = root
@@ -160,20 +502,52 @@ def get_boosted_freq(word, pos_tag=None):
         
     return score
 
-def generate_json_with_scores(input_file, output_file):
+def score_words(words, pos_tag=None):
+    # 2. Likeness Score (0-100), vectorised over the whole batch
+    like_scores = calculate_likeness_batch(words)
+
+    # Score every distinct root of the batch once up front
+    base_scores, root_scores, candidates = build_root_table(words, pos_tag)
+
+    results = []
+    for word, like_score in zip(words, like_scores):
+        # 1. Frequency Score (with smart boosting)
+        freq_score = get_boosted_freq(word, pos_tag, root_scores, base_scores[word], candidates.get(word))
+        
+        results.append((word, freq_score, like_score))
+    return results
+
+def _init_worker(probs, min_prob, scorer):
+    # Workers receive the trained model from the parent instead of retraining
+    global bigram_probs, min_log_prob, likeness_scorer
+    bigram_probs = probs
+    min_log_prob = min_prob
+    likeness_scorer = scorer
+    build_bigram_matrix()
+
+def _score_chunk(args):
+    words, pos_tag = args
+    return score_words(words, pos_tag)
+
+def current_model_hash():
+    if likeness_scorer is not None:
+        return model_hash(likeness_scorer.to_dict())
+    return model_hash([bigram_probs, min_log_prob])
+
+def generate_json_with_scores(input_file, output_file, workers=1, chunk_size=5000, cache_path=None):
     filename = os.path.basename(input_file)
     print(f"Processing {filename}...")
     
     # Determine POS tag for lemmatization
     pos_tag = None
     if 'verb' in filename:
-        pos_tag = wordnet.VERB
+        pos_tag = VERB
     elif 'noun' in filename:
-        pos_tag = wordnet.NOUN
+        pos_tag = NOUN
     elif 'adjective' in filename:
-        pos_tag = wordnet.ADJ
+        pos_tag = ADJ
     elif 'adverb' in filename:
-        pos_tag = wordnet.ADV
+        pos_tag = ADV
     
     try:
         with open(input_file, 'r', encoding='utf-8') as f:
@@ -182,33 +556,135 @@ def generate_json_with_scores(input_file, output_file):
         print(f"Error: {input_file} not found.")
         return
 
-    data = {}
-    
-    for word in words:
-        # 1. Frequency Score (with smart boosting)
-        freq_score = get_boosted_freq(word, pos_tag)
-        
-        # 2. Likeness Score (0-100)
-        like_score = calculate_likeness(word)
-        
-        # Structure: Object with two scores
-        data[word] = {
-            "freq": freq_score,
-            "like": like_score
-        }
+    # Scored in sorted order, so each chunk can be written out as soon as it is done
+    scored = iter_scored(sorted(set(words)), pos_tag, workers, chunk_size, cache_path)
+    write_scored_json(scored, output_file)
 
-    # Sort alphabetically
-    sorted_data = dict(sorted(data.items()))
+def iter_scored(words, pos_tag=None, workers=1, chunk_size=5000, cache_path=None):
+    """
+    Yield (word, freq, like) for `words` in order, one chunk at a time, scoring
+    only words missing from the cache. With workers != 1, chunks are scored in a
+    process pool (0 = all cores) with a bounded number in flight.
+    """
+    cache = None
+    if cache_path:
+        # Single tags keep their historical key, so the per-file and columnar modes share rows
+        tag_key = pos_tag if pos_tag is None or isinstance(pos_tag, str) else "".join(pos_tag)
+        cache = ScoreCache(cache_path, lang='en', scorer=f"{SCORER_VERSION}:{tag_key}", model=current_model_hash())
 
-    # Write JSON
+    def merge(chunk, cached, scored):
+        if cache is not None and scored:
+            cache.put_many(scored)
+        if not cached:
+            return scored
+        fresh = {w: (f, l) for (w, f, l) in scored}
+        return [(w,) + (cached[w] if w in cached else fresh[w]) for w in chunk]
+
+    chunks = (words[i:i + chunk_size] for i in range(0, len(words), chunk_size))
+    parallel = workers != 1 and len(words) > chunk_size
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    executor = None
+    in_flight = deque()
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(sorted_data, f, indent=2, ensure_ascii=False)
-        print(f" -> Wrote {len(sorted_data)} items to {os.path.basename(output_file)}")
-    except Exception as e:
-        print(f"Error writing JSON: {e}")
+        for chunk in chunks:
+            cached = cache.get_many(chunk) if cache is not None else {}
+            todo = [w for w in chunk if w not in cached] if cached else chunk
+            if not parallel:
+                yield from merge(chunk, cached, score_words(todo, pos_tag))
+                continue
+            if executor is None and todo:
+                # Dump the frequency table and POS index here if needed, so workers do not race to build them
+                get_freq_table('en')
+                if pos_tag:
+                    get_pos_index()
+                executor = ProcessPoolExecutor(max_workers=workers or None, initializer=_init_worker,
+                                               initargs=(bigram_probs, min_log_prob, likeness_scorer))
+            future = executor.submit(score_words, todo, pos_tag) if todo else None
+            in_flight.append((chunk, cached, future))
+            # Results are taken in submission order, so the output is deterministic
+            while in_flight and (len(in_flight) > max_in_flight or in_flight[0][2] is None):
+                chunk, cached, future = in_flight.popleft()
+                yield from merge(chunk, cached, future.result() if future is not None else [])
+        while in_flight:
+            chunk, cached, future = in_flight.popleft()
+            yield from merge(chunk, cached, future.result() if future is not None else [])
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    if not parallel:
+        stats = memo_stats()
+        if stats:
+            print(f" -> {stats}")
+    if cache is not None:
+        print(f" -> Score {cache.stats()}")
+        cache.close()
+
+def write_scored_json(scored, output_file):
+    """Stream (word, freq, like) rows, sorted by word without duplicates, to a JSON map."""
+    # Structure: Object with two scores
+    members = ((word, {"freq": freq_score, "like": like_score}) for word, freq_score, like_score in scored)
+    # Scoring runs inside write_json_map; errors propagate and the old file is kept
+    count = write_json_map(output_file, members)
+    print(f" -> Wrote {count} items to {os.path.basename(output_file)}")
+
+def generate_columnar(table_path, views_dir=None, workers=1, chunk_size=5000, cache_path=None):
+    """
+    Score every distinct word of a classify_words columnar table once, write
+    freq/like back into the table, and optionally derive the per-category JSON
+    views from it. A word in several lemmatized categories gets one freq, with
+    root candidates from all of its lemmas.
+    """
+    print(f"Processing {os.path.basename(table_path)}...")
+    try:
+        with BinaryWordlist(table_path) as wl:
+            rows = [(wl.word_at(i), wl.pos_at(i)) for i in range(len(wl))]
+    except FileNotFoundError:
+        print(f"Error: {table_path} not found.")
+        return
+
+    # Group by lemmatizer POS set so each group is scored (and cached) like one file
+    groups = defaultdict(list)
+    group_keys = {}
+    for word, mask in rows:
+        key = group_keys.get(mask, 0)
+        if key == 0:
+            tags = tuple(pos for cat, pos in CATEGORY_POS.items() if mask & CATEGORY_BITS[cat])
+            key = group_keys[mask] = tags[0] if len(tags) == 1 else tags or None
+        groups[key].append(word)
+    scores = {}
+    for pos_tag, words in groups.items():
+        print(f" -> {len(words)} words lemmatized as {pos_tag}")
+        for word, freq_score, like_score in iter_scored(words, pos_tag, workers, chunk_size, cache_path):
+            scores[word] = (freq_score, like_score)
+
+    write_binary(table_path, ((w,) + scores[w] + (mask,) for w, mask in rows))
+    print(f" -> Wrote scores for {len(rows)} distinct words to {os.path.basename(table_path)}")
+
+    if views_dir:
+        if not os.path.exists(views_dir):
+            os.makedirs(views_dir)
+        for cat, filename in CATEGORY_FILES.items():
+            bit = CATEGORY_BITS[cat]
+            # Table rows are already sorted by word
+            view = ((w,) + scores[w] for w, mask in rows if mask & bit)
+            write_scored_json(view, os.path.join(views_dir, filename.replace('.txt', '.json')))
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate JSON wordlists with frequency and likeness scores.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of scoring processes (default: 1 = serial, 0 = all cores)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Words per chunk sent to each worker (default: 5000)")
+    parser.add_argument("--model", default="bigram", choices=["bigram"] + list(NGRAM_MODELS),
+                        help="Character model used for the likeness score (default: bigram)")
+    parser.add_argument("--model-dir", default=DEFAULT_MODEL_DIR, help="Where trained models are saved and reused (default: .cache/models)")
+    parser.add_argument("--retrain", action="store_true", help="Train the likeness model even if a saved one is up to date")
+    parser.add_argument("--columnar", nargs="?", const="", metavar="TABLE",
+                        help="Score a classify_words columnar table (default: wordlist_new/words.wlb) once per distinct word instead of the txt files")
+    parser.add_argument("--no-views", action="store_true", help="With --columnar, do not write the per-category JSON views")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Path to the persistent score cache (SQLite)")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every score without reading or writing the cache")
+    args = parser.parse_args()
+
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     input_dir = os.path.join(base_dir, 'wordlist_new')
     output_dir = os.path.join(input_dir, 'json')
@@ -218,14 +694,23 @@ def main():
         os.makedirs(output_dir)
 
     # Train model first
-    train_bigram_model(reference_file)
+    load_or_train_likeness_model(args.model, reference_file, model_dir=args.model_dir, retrain=args.retrain)
+
+    if args.columnar is not None:
+        generate_columnar(args.columnar or os.path.join(input_dir, COLUMNAR_FILE),
+                          views_dir=None if args.no_views else output_dir,
+                          workers=args.workers, chunk_size=args.chunk_size,
+                          cache_path=None if args.no_cache else args.cache)
+        print("\nAll done! Scores written to the columnar table" + ("" if args.no_views else " and wordlist_new/json/"))
+        return
 
     # Process all txt files in wordlist_new
     for filename in os.listdir(input_dir):
         if filename.endswith(".txt"):
             input_path = os.path.join(input_dir, filename)
             output_path = os.path.join(output_dir, filename.replace('.txt', '.json'))
-            generate_json_with_scores(input_path, output_path)
+            generate_json_with_scores(input_path, output_path, workers=args.workers, chunk_size=args.chunk_size,
+                                      cache_path=None if args.no_cache else args.cache)
 
     print("\nAll done! JSON files with frequency and likeness scores generated in wordlist_new/json/")
 
@@ -0,0 +1,101 @@
+import json
+import os
+from json.encoder import encode_basestring
+
+# Incremental writer for the {word: scores} maps the scoring tools produce, so
+# members go to disk as they are scored instead of being collected into a dict
+# (and a sorted copy of it) first.
+#
+# The JSON output is byte-identical to json.dump(mapping, f, indent=2,
+# ensure_ascii=False) of the same members in the same order.
+
+# Members joined per write() call
+_WRITE_BATCH = 4096
+
+
+def _dumps(value):
+    # Same text json.dumps gives for scalars, without its per-call setup
+    cls = value.__class__
+    if cls is str:
+        return encode_basestring(value)
+    if cls is float:
+        if value != value or value in (float('inf'), float('-inf')):
+            return json.dumps(value)
+        return float.__repr__(value)
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if cls is int:
+        return int.__repr__(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _format_value(value):
+    # Flat dicts ({"freq": .., "like": ..}) are the common case; formatting them
+    # here keeps every scalar on the C encoder, which indent= bypasses
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        if all(not isinstance(v, (dict, list, tuple)) for v in value.values()):
+            members = ",\n    ".join(f"{_dumps(k)}: {_dumps(v)}" for k, v in value.items())
+            return "{\n    " + members + "\n  }"
+    elif not isinstance(value, (list, tuple)):
+        return _dumps(value)
+    return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+
+
+class JsonMapWriter:
+    """
+    Write a JSON object one member at a time to an open text file. Callers give
+    members in output order; keys are not checked for duplicates.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.count = 0
+
+    def _format(self, key, value):
+        return ("{\n  " if self.count == 0 else ",\n  ") + _dumps(key) + ": " + _format_value(value)
+
+    def write(self, key, value):
+        self.f.write(self._format(key, value))
+        self.count += 1
+
+    def write_many(self, members):
+        buf = []
+        for key, value in members:
+            buf.append(self._format(key, value))
+            self.count += 1
+            if len(buf) >= _WRITE_BATCH:
+                self.f.write("".join(buf))
+                buf = []
+        if buf:
+            self.f.write("".join(buf))
+
+    def close(self):
+        """Finish the object; the file itself stays open."""
+        self.f.write("{}" if self.count == 0 else "\n}")
+
+
+def write_json_map(path, members):
+    """
+    Stream (key, value) `members` to `path` as a JSON object. Returns the number
+    written. `members` is often a lazy scoring pipeline, so the map goes to a
+    temporary file first and `path` keeps its old content if anything raises.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            writer = JsonMapWriter(f)
+            writer.write_many(members)
+            writer.close()
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return writer.count
+
@@ -0,0 +1,205 @@
+import math
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+# Pluggable word-likeness scorers for generate_freq_json.py.
+#
+# A scorer turns a word into its average log probability per character
+# transition (including the "$" end marker) and maps that onto the 0-100
+# likeness scale between `lower_bound` and `upper_bound`.
+#
+# The built-in bigram model lives in generate_freq_json.py; this module adds
+# higher-order character models with interpolated Kneser-Ney smoothing, which
+# penalise implausible strings that only look fine one letter pair at a time.
+
+START = "^"
+END = "$"
+
+
+class LikenessScorer(ABC):
+    name = "base"
+    # Average log prob per transition mapped to [0, 100]
+    lower_bound = -7.0
+    upper_bound = -1.5
+
+    @abstractmethod
+    def avg_log_prob(self, word):
+        """Average log probability per character transition, including the end marker."""
+
+    def normalise(self, avg_log_prob):
+        score = (avg_log_prob - self.lower_bound) / (self.upper_bound - self.lower_bound) * 100
+        if score < 0: score = 0.0
+        if score > 100: score = 100.0
+        return round(score, 2)
+
+    def score(self, word):
+        return self.normalise(self.avg_log_prob(word))
+
+    def score_batch(self, words):
+        return [self.score(w) for w in words]
+
+    def calibrate(self, words, upper_pct=0.95):
+        """
+        Place the 0-100 scale for this model: the upper bound at the given
+        percentile of the training words, and the same span as the bigram scale.
+        """
+        values = sorted(self.avg_log_prob(w) for w in words)
+        if not values:
+            return self
+        span = LikenessScorer.upper_bound - LikenessScorer.lower_bound
+        self.upper_bound = values[min(len(values) - 1, int(len(values) * upper_pct))]
+        self.lower_bound = self.upper_bound - span
+        return self
+
+
+class KneserNeyScorer(LikenessScorer):
+    """
+    Character n-gram model with interpolated Kneser-Ney smoothing, stored in
+    backoff form: one dict of log P for every seen n-gram (all orders) and one
+    dict of log backoff weights for every seen context. A transition is then at
+    most `order` dict lookups, and results are memoised per n-gram.
+    """
+
+    def __init__(self, order=3):
+        if order < 2:
+            raise ValueError("order must be at least 2")
+        self.order = order
+        self.name = f"{order}gram" if order != 3 else "trigram"
+        self.log_probs = {}
+        self.log_backoff = {}
+        self.vocab_size = 0
+        self._unseen_unigram = 1.0
+        self._memo = {}
+
+    def _pad(self, word):
+        return START * (self.order - 1) + word + END
+
+    def train(self, words):
+        n = self.order
+        # counts[k][ngram]: raw counts for the top order, continuation counts below
+        counts = [None] + [defaultdict(int) for _ in range(n)]
+        vocab = set()
+        for word in words:
+            padded = self._pad(word)
+            vocab.update(padded[n - 1:])
+            for i in range(n - 1, len(padded)):
+                counts[n][padded[i - n + 1:i + 1]] += 1
+        for k in range(n, 1, -1):
+            for gram in counts[k]:
+                # Each distinct left extension adds one continuation count
+                counts[k - 1][gram[1:]] += 1
+        self.vocab_size = max(len(vocab), 1)
+
+        # Filled level by level; lookups for unseen lower grams read them as they grow
+        log_probs = self.log_probs = {}
+        log_backoff = self.log_backoff = {}
+        # Unigram level: discounted continuation counts interpolated with uniform
+        unigrams = counts[1]
+        total = sum(unigrams.values())
+        d = self._discount(unigrams)
+        uniform = 1.0 / self.vocab_size
+        gamma = d * len(unigrams) / total
+        probs = {w: max(c - d, 0) / total + gamma * uniform for w, c in unigrams.items()}
+        self._unseen_unigram = gamma * uniform
+        lower = probs
+        for w, p in probs.items():
+            log_probs[w] = math.log(p)
+
+        for k in range(2, n + 1):
+            level = counts[k]
+            d = self._discount(level)
+            context_totals = defaultdict(int)
+            context_types = defaultdict(int)
+            for gram, c in level.items():
+                context_totals[gram[:-1]] += c
+                context_types[gram[:-1]] += 1
+            probs = {}
+            for gram, c in level.items():
+                h = gram[:-1]
+                g = d * context_types[h] / context_totals[h]
+                probs[gram] = max(c - d, 0) / context_totals[h] + g * self._lower_prob(lower, gram[1:])
+            for h, total_h in context_totals.items():
+                log_backoff[h] = math.log(d * context_types[h] / total_h)
+            for gram, p in probs.items():
+                log_probs[gram] = math.log(p)
+            lower = {g: math.exp(lp) for g, lp in log_probs.items() if len(g) == k}
+
+        self._memo = {}
+        return self
+
+    @staticmethod
+    def _discount(level):
+        # Ney's estimate D = n1 / (n1 + 2 * n2), from the counts-of-counts
+        n1 = sum(1 for c in level.values() if c == 1)
+        n2 = sum(1 for c in level.values() if c == 2)
+        if n1 == 0 or n2 == 0:
+            return 0.5
+        return n1 / (n1 + 2 * n2)
+
+    def _lower_prob(self, lower, gram):
+        # Only used while training, where `lower` holds the next order down
+        if gram in lower:
+            return lower[gram]
+        return math.exp(self._log_prob(gram))
+
+    def _log_prob(self, gram):
+        lp = self.log_probs.get(gram)
+        if lp is not None:
+            return lp
+        if len(gram) == 1:
+            return math.log(self._unseen_unigram)
+        return self.log_backoff.get(gram[:-1], 0.0) + self._log_prob(gram[1:])
+
+    def avg_log_prob(self, word):
+        padded = self._pad(word)
+        n = self.order
+        memo = self._memo
+        log_sum = 0.0
+        for i in range(n - 1, len(padded)):
+            gram = padded[i - n + 1:i + 1]
+            lp = memo.get(gram)
+            if lp is None:
+                lp = memo[gram] = self._log_prob(gram)
+            log_sum += lp
+        return log_sum / (len(padded) - n + 1)
+
+    def to_dict(self):
+        return {
+            "type": "kneser-ney",
+            "order": self.order,
+            "vocab_size": self.vocab_size,
+            "unseen_unigram": self._unseen_unigram,
+            "lower_bound": self.lower_bound,
+            "upper_bound": self.upper_bound,
+            "log_probs": self.log_probs,
+            "log_backoff": self.log_backoff,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        scorer = cls(data["order"])
+        scorer.vocab_size = data["vocab_size"]
+        scorer._unseen_unigram = data["unseen_unigram"]
+        scorer.lower_bound = data["lower_bound"]
+        scorer.upper_bound = data["upper_bound"]
+        scorer.log_probs = data["log_probs"]
+        scorer.log_backoff = data["log_backoff"]
+        return scorer
+
+    def __getstate__(self):
+        # Workers rebuild the memo themselves
+        state = dict(self.__dict__)
+        state["_memo"] = {}
+        return state
+
+
+# Higher-order models selectable by name; "bigram" is the built-in model
+NGRAM_MODELS = {
+    "trigram": 3,
+    "4gram": 4,
+}
+
+
+def train_ngram_scorer(name, words):
+    scorer = KneserNeyScorer(NGRAM_MODELS[name]).train(words)
+    return scorer.calibrate(words)
@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import string
+import time
+
+from lookup_server import MAX_LINE_BYTES
+
+# Load generator for lookup_server.py: opens N connections, each sending batched
+# lookups back to back for a fixed duration, then reports throughput and
+# client-observed round-trip latency.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_sample_words(dirs, limit):
+    words = []
+    for d in dirs:
+        for path in glob.glob(os.path.join(d, '*.txt')):
+            with open(path, 'r', encoding='utf-8') as f:
+                words.extend(line.strip() for line in f if line.strip())
+    random.shuffle(words)
+    return words[:limit]
+
+
+def random_junk(n):
+    return [''.join(random.choices(string.ascii_lowercase, k=random.randint(3, 9))) for _ in range(n)]
+
+
+async def client(args, words, deadline, latencies, counters):
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix, limit=MAX_LINE_BYTES)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port, limit=MAX_LINE_BYTES)
+    try:
+        while time.perf_counter() < deadline:
+            batch = random.sample(words, args.batch)
+            start = time.perf_counter_ns()
+            writer.write(json.dumps({"words": batch}).encode('utf-8') + b'\n')
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                break
+            latencies.append(time.perf_counter_ns() - start)
+            response = json.loads(line)
+            counters["requests"] += 1
+            counters["words"] += len(batch)
+            counters["valid"] += sum(1 for r in response.get("results", []) if r["valid"])
+    finally:
+        writer.close()
+
+
+async def run(args):
+    words = load_sample_words(args.words_dir or [os.path.join(BASE_DIR, 'wordlist_new')], args.sample)
+    # Mix in strings that are (almost certainly) not words, like real failed guesses
+    words += random_junk(int(len(words) * args.junk_ratio))
+    if len(words) < args.batch:
+        print("Not enough sample words for the requested batch size.")
+        return
+
+    latencies = []
+    counters = {"requests": 0, "words": 0, "valid": 0}
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(client(args, words, deadline, latencies, counters) for _ in range(args.connections)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] / 1000 if latencies else 0.0
+
+    print(f"Requests: {counters['requests']} in {elapsed:.2f}s "
+          f"({counters['requests'] / elapsed:.0f} req/s, {counters['words'] / elapsed:.0f} words/s)")
+    print(f"Valid words: {counters['valid']}/{counters['words']}")
+    print(f"Round-trip latency: p50 {pct(0.50):.0f} us, p99 {pct(0.99):.0f} us, max {pct(1.0):.0f} us")
+
+    # Server-side service time, excluding the network and JSON round trip
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix, limit=MAX_LINE_BYTES)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port, limit=MAX_LINE_BYTES)
+    writer.write(b'{"cmd": "stats"}\n')
+    await writer.drain()
+    stats = json.loads(await reader.readline())
+    writer.close()
+    print(f"Server service time: p50 {stats['p50_us']} us, p99 {stats['p99_us']} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure lookup_server.py throughput and latency.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Connect to this Unix socket instead of TCP")
+    parser.add_argument("--connections", type=int, default=8, help="Concurrent connections (default: 8)")
+    parser.add_argument("--batch", type=int, default=32, help="Words per request (default: 32)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run (default: 10)")
+    parser.add_argument("--words-dir", action="append", help="Directory of *.txt wordlists to sample from; repeatable (default: wordlist_new)")
+    parser.add_argument("--sample", type=int, default=50000, help="Number of real words to sample (default: 50000)")
+    parser.add_argument("--junk-ratio", type=float, default=0.2, help="Extra random non-words, as a fraction of the sample (default: 0.2)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import argparse
+import asyncio
+import glob
+import json
+import os
+import signal
+import time
+from collections import deque
+
+from binary_wordlist import BinaryWordlist
+from word_filter import BloomFilter, filter_path
+
+# Long-running lookup service over the generated wordlists.
+#
+# Protocol: newline-delimited JSON over TCP or a Unix socket.
+#   {"words": ["gym", "xqzt"]}
+#     -> {"results": [{"word": "gym", "valid": true, "categories": {"nouns": {"freq": 55.38, "like": 71.2}}},
+#                     {"word": "xqzt", "valid": false, "categories": {}}]}
+#   {"cmd": "stats"}   -> categories, word counts, request count, p50/p99 service time in microseconds
+#   {"cmd": "reload"}  -> reload changed files now
+#
+# A category served from a .wlb with an up-to-date .bloom next to it (see
+# word_filter.py) answers most misses from the filter without a binary search.
+#
+# All categories are loaded once into an immutable snapshot. Reloads build a new
+# snapshot off the event loop and swap the reference, so requests in flight keep
+# answering from the old one and nothing is dropped.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DIRS = [os.path.join(BASE_DIR, 'wordlist_new', 'json')]
+
+# Number of recent request timings kept for latency percentiles
+LATENCY_WINDOW = 100000
+
+# Longest request line accepted (asyncio's default is 64 KB, too small for big batches)
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+def _source_files(dirs, warn=False):
+    """{category: path}, preferring an exported .wlb over its JSON when it is at least as new."""
+    sources = {}
+    for d in dirs:
+        for json_path in sorted(glob.glob(os.path.join(d, '*.json'))):
+            category = os.path.splitext(os.path.basename(json_path))[0]
+            path = json_path
+            wlb_path = os.path.splitext(json_path)[0] + '.wlb'
+            if os.path.exists(wlb_path) and os.path.getmtime(wlb_path) >= os.path.getmtime(json_path):
+                path = wlb_path
+            if warn and category in sources:
+                print(f"Warning: category '{category}' from {path} replaces {sources[category]}")
+            sources[category] = path
+    return sources
+
+
+def _load_json_store(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    store = {}
+    for word, value in data.items():
+        if isinstance(value, dict):
+            store[word] = {"freq": value.get("freq"), "like": value.get("like")}
+        else:
+            store[word] = {"freq": value, "like": None}
+    return store
+
+
+class _WlbStore:
+    def __init__(self, path):
+        self.wl = BinaryWordlist(path)
+
+    def get(self, word):
+        scores = self.wl.get(word)
+        if scores is None:
+            return None
+        return {"freq": scores[0], "like": scores[1]}
+
+    def __len__(self):
+        return len(self.wl)
+
+
+class _FilteredStore:
+    def __init__(self, store, bloom):
+        self.store = store
+        self.bloom = bloom
+        self.rejected = 0
+
+    def get(self, word):
+        if not self.bloom.might_contain(word):
+            self.rejected += 1
+            return None
+        return self.store.get(word)
+
+    def __len__(self):
+        return len(self.store)
+
+
+def _filter_mtime(path):
+    bloom_path = filter_path(path)
+    return os.path.getmtime(bloom_path) if os.path.exists(bloom_path) else None
+
+
+class Snapshot:
+    def __init__(self, dirs):
+        self.sources = _source_files(dirs, warn=True)
+        self.mtimes = {c: os.path.getmtime(p) for c, p in self.sources.items()}
+        # A filter built (or rebuilt) later also triggers a reload
+        self.filter_mtimes = {c: _filter_mtime(p) for c, p in self.sources.items()}
+        self.stores = {}
+        for category, path in self.sources.items():
+            if path.endswith('.wlb'):
+                store = _WlbStore(path)
+                # A filter older than its list may be missing words; ignore it until rebuilt
+                filter_mtime = self.filter_mtimes[category]
+                if filter_mtime is not None and filter_mtime >= self.mtimes[category]:
+                    store = _FilteredStore(store, BloomFilter(filter_path(path)))
+                self.stores[category] = store
+            else:
+                self.stores[category] = _load_json_store(path)
+        self.loaded_at = time.time()
+
+    def lookup(self, word):
+        word = word.strip().lower()
+        categories = {}
+        for category, store in self.stores.items():
+            scores = store.get(word)
+            if scores is not None:
+                categories[category] = scores
+        return {"word": word, "valid": bool(categories), "categories": categories}
+
+    def is_stale(self, dirs):
+        sources = _source_files(dirs)
+        if sources != self.sources:
+            return True
+        try:
+            return any(os.path.getmtime(p) != self.mtimes[c] or _filter_mtime(p) != self.filter_mtimes[c]
+                       for c, p in sources.items())
+        except OSError:
+            return True
+
+
+class LookupServer:
+    def __init__(self, dirs):
+        self.dirs = dirs
+        self.snapshot = Snapshot(dirs)
+        self.requests = 0
+        self.timings_ns = deque(maxlen=LATENCY_WINDOW)
+        self._reload_lock = asyncio.Lock()
+        self._describe("Loaded")
+
+    def _describe(self, action):
+        counts = ", ".join(f"{c}: {len(s)}" for c, s in sorted(self.snapshot.stores.items()))
+        print(f"{action} {len(self.snapshot.stores)} categories ({counts})")
+
+    async def reload(self, force=False):
+        async with self._reload_lock:
+            if not force and not self.snapshot.is_stale(self.dirs):
+                return False
+            try:
+                snapshot = await asyncio.get_running_loop().run_in_executor(None, Snapshot, self.dirs)
+            except Exception as e:
+                # Keep serving the previous snapshot if a file is mid-write or broken
+                print(f"Reload failed, keeping previous data: {e}")
+                return False
+            self.snapshot = snapshot
+            self._describe("Reloaded")
+            return True
+
+    async def watch(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reload()
+            except Exception as e:
+                print(f"Error while checking for updates: {e}")
+
+    def stats(self):
+        timings = sorted(self.timings_ns)
+
+        def pct(p):
+            if not timings:
+                return None
+            return round(timings[min(len(timings) - 1, int(len(timings) * p))] / 1000, 1)
+
+        return {
+            "categories": {c: len(s) for c, s in self.snapshot.stores.items()},
+            "filtered": sorted(c for c, s in self.snapshot.stores.items() if isinstance(s, _FilteredStore)),
+            "filter_rejects": sum(s.rejected for s in self.snapshot.stores.values() if isinstance(s, _FilteredStore)),
+            "loaded_at": self.snapshot.loaded_at,
+            "requests": self.requests,
+            "p50_us": pct(0.50),
+            "p99_us": pct(0.99),
+        }
+
+    async def handle_request(self, request):
+        if "words" in request:
+            words = request["words"]
+            if not isinstance(words, list) or not all(isinstance(w, str) for w in words):
+                raise ValueError("words must be a list of strings")
+            start = time.perf_counter_ns()
+            snapshot = self.snapshot
+            response = {"results": [snapshot.lookup(w) for w in words]}
+            self.timings_ns.append(time.perf_counter_ns() - start)
+            self.requests += 1
+            return response
+        cmd = request.get("cmd")
+        if cmd == "stats":
+            return self.stats()
+        if cmd == "reload":
+            return {"reloaded": await self.reload(force=True)}
+        return {"error": f"unknown request: {sorted(request)}"}
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await _read_line(reader)
+                if not line:
+                    break
+                try:
+                    if line is _TOO_LONG:
+                        raise ValueError(f"request longer than {MAX_LINE_BYTES} bytes")
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                    response = await self.handle_request(request)
+                except (ValueError, TypeError) as e:
+                    response = {"error": str(e)}
+                writer.write(json.dumps(response, separators=(',', ':')).encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+_TOO_LONG = object()
+
+
+async def _read_line(reader):
+    """The next request line, b'' at EOF, or _TOO_LONG after skipping past an oversized line."""
+    skipping = False
+    while True:
+        try:
+            line = await reader.readuntil(b'\n')
+            return _TOO_LONG if skipping else line
+        except asyncio.IncompleteReadError as e:
+            return _TOO_LONG if skipping and e.partial else e.partial
+        except asyncio.LimitOverrunError as e:
+            # Drop what is buffered up to the newline (or all of it) and keep going
+            await reader.readexactly(e.consumed)
+            skipping = True
+
+
+async def serve(args):
+    server = LookupServer(args.dir or DEFAULT_DIRS)
+    if args.unix:
+        listener = await asyncio.start_unix_server(server.handle_client, path=args.unix, limit=MAX_LINE_BYTES)
+        print(f"Listening on unix:{args.unix}")
+    else:
+        listener = await asyncio.start_server(server.handle_client, args.host, args.port, limit=MAX_LINE_BYTES)
+        print(f"Listening on {args.host}:{args.port}")
+
+    if hasattr(signal, "SIGHUP"):
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(server.reload(force=True)))
+
+    watcher = None
+    if args.reload_interval > 0:
+        watcher = asyncio.ensure_future(server.watch(args.reload_interval))
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve batched word validity / score lookups over the generated wordlists.")
+    parser.add_argument("--dir", action="append", help="Directory of category JSON (and optional .wlb) files; repeatable (default: wordlist_new/json)")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765)")
+    parser.add_argument("--unix", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--reload-interval", type=float, default=2.0, help="Seconds between checks for updated files (0 disables; SIGHUP forces a reload)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from score_cache import DEFAULT_CACHE_PATH, file_hash
+
+# One entry point for the whole wordlist build. Each stage is one of the
+# existing scripts, run as a subprocess, with the files it reads and writes
+# declared as globs relative to the project root:
+#
+#   clean -> classify -> expand -> freq_json        (1000000.txt -> wordlist_new/)
+#   failures -> preprocess -> sort                  (wordlist/, preprocessed/)
+#
+# After a stage succeeds, the sha1 of every file it touches is recorded in
+# .cache/pipeline.json. A stage is skipped while those hashes, and its command,
+# are unchanged. An output that a downstream stage in the same run rewrites
+# (expand rewrites the classify lists in place) is only recorded under that
+# stage, otherwise the earlier stage would look stale after every run. Staleness is checked when a stage becomes ready, so a stage
+# whose upstream rewrote its inputs with identical content is still skipped.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOOLS_DIR = os.path.join(BASE_DIR, 'tools')
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), 'pipeline.json')
+
+CATEGORY_TXTS = [
+    'wordlist_new/nouns.txt', 'wordlist_new/verb.txt', 'wordlist_new/adjectives.txt',
+    'wordlist_new/adverbs.txt', 'wordlist_new/pronouns.txt', 'wordlist_new/conjunctions.txt',
+    'wordlist_new/others.txt',
+]
+
+_print_lock = threading.Lock()
+
+
+class Stage:
+    def __init__(self, name, script, args=(), inputs=(), outputs=(), deps=(), default=True):
+        self.name = name
+        self.script = script
+        self.args = list(args)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+        # Stages with default=False only run when asked for by name
+        self.default = default
+        # Output patterns of the selected stages downstream of this one; set by run_pipeline
+        self.later_outputs = []
+
+    def command(self):
+        return [sys.executable, os.path.join(TOOLS_DIR, self.script)] + self.args
+
+    def signature(self):
+        # What is recorded: independent of the interpreter and checkout location
+        return [self.script] + self.args
+
+
+def build_stages(workers=1):
+    worker_args = ['--workers', str(workers)] if workers != 1 else []
+    # sort_json.py sorts preprocessed/ when it has JSON, otherwise wordlist/
+    sort_dir = 'preprocessed' if glob.glob(os.path.join(BASE_DIR, 'preprocessed', '*.json')) else 'wordlist'
+    # The columnar table only exists once classify_words --columnar has run
+    columnar = ['wordlist_new/words.wlb'] if os.path.exists(os.path.join(BASE_DIR, 'wordlist_new', 'words.wlb')) else []
+    stages = [
+        Stage('clean', 'clean_reference.py',
+              inputs=['1000000.txt'], outputs=['1000000_clean.txt']),
+        Stage('classify', 'classify_words.py', worker_args,
+              inputs=['1000000_clean.txt'], outputs=CATEGORY_TXTS, deps=['clean']),
+        # Expands the category lists in place
+        Stage('expand', 'expand_wordlist.py', ['1000000_clean.txt'] + CATEGORY_TXTS,
+              inputs=['1000000_clean.txt'] + CATEGORY_TXTS, outputs=CATEGORY_TXTS, deps=['classify']),
+        Stage('freq_json', 'generate_freq_json.py', worker_args,
+              inputs=['1000000_clean.txt', 'wordlist_new/*.txt'], outputs=['wordlist_new/json/*.json'],
+              deps=['expand']),
+        # Patches the outputs of the other stages in place, so it is not run
+        # alongside them unless asked for
+        Stage('failures', 'process_failures.py',
+              inputs=['fail*.txt', 'fail_filter/fail1_clean.txt'],
+              outputs=['fail_filter/fail1_clean.txt', 'wordlist/*.txt', 'wordlist/*.json', 'wordlist_new/*.txt',
+                       'preprocessed/*.json', 'wordlist_new/json/*.json'] + columnar,
+              default=False),
+        Stage('preprocess', 'preprocess_all.py', worker_args,
+              inputs=['wordlist/*.txt'], outputs=['wordlist/*.json'], deps=['failures']),
+        Stage('sort', 'sort_json.py',
+              inputs=[f'{sort_dir}/*.json'], outputs=[f'{sort_dir}/*.json'], deps=['preprocess']),
+    ]
+    return {s.name: s for s in stages}
+
+
+def select_stages(stages, targets):
+    """Names to run, in definition order: the targets and everything upstream of them."""
+    if not targets:
+        return [name for name, s in stages.items() if s.default]
+    selected = set()
+    todo = list(targets)
+    while todo:
+        name = todo.pop()
+        if name in selected:
+            continue
+        selected.add(name)
+        # Optional stages upstream are only ordering constraints, not requirements
+        todo.extend(d for d in stages[name].deps if stages[d].default or d in targets)
+    return [name for name in stages if name in selected]
+
+
+def set_later_outputs(stages, names):
+    """Give each selected stage the output patterns of the selected stages that (transitively) depend on it."""
+    selected = set(names)
+    dependents = {n: [m for m in names if n in stages[m].deps] for n in names}
+    for name in names:
+        downstream = set()
+        todo = list(dependents[name])
+        while todo:
+            other = todo.pop()
+            if other in downstream or other not in selected:
+                continue
+            downstream.add(other)
+            todo.extend(dependents[other])
+        stages[name].later_outputs = [p for other in names if other in downstream for p in stages[other].outputs]
+
+
+def expand_patterns(patterns):
+    paths = set()
+    for pattern in patterns:
+        paths.update(os.path.relpath(p, BASE_DIR) for p in glob.glob(os.path.join(BASE_DIR, pattern)))
+    return sorted(p.replace(os.sep, '/') for p in paths)
+
+
+def missing_inputs(stage):
+    # Glob inputs may legitimately match nothing (e.g. no fail*.txt yet)
+    return [p for p in stage.inputs if not glob.has_magic(p) and not os.path.exists(os.path.join(BASE_DIR, p))]
+
+
+class StageState:
+    """Recorded file hashes per stage, plus a (size, mtime) memo so unchanged files are not rehashed."""
+
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        self.path = path
+        self.data = {"stages": {}, "hashes": {}}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError):
+                print(f"Warning: ignoring unreadable pipeline state {path}")
+        self.lock = threading.Lock()
+
+    def hash_file(self, rel_path):
+        st = os.stat(os.path.join(BASE_DIR, rel_path))
+        with self.lock:
+            known = self.data["hashes"].get(rel_path)
+        if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+            return known[2]
+        digest = file_hash(os.path.join(BASE_DIR, rel_path))
+        with self.lock:
+            self.data["hashes"][rel_path] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def snapshot(self, stage):
+        # Outputs another stage rewrites afterwards belong to that stage
+        outputs = set(expand_patterns(stage.outputs)) - set(expand_patterns(stage.later_outputs))
+        files = set(expand_patterns(stage.inputs)) | outputs
+        return {path: self.hash_file(path) for path in sorted(files)}
+
+    def reason_to_run(self, stage, command):
+        """Why `stage` is out of date, or None when it can be skipped."""
+        record = self.data["stages"].get(stage.name)
+        if record is None:
+            return "never run"
+        if record["command"] != command:
+            return "command changed"
+        for pattern in stage.outputs:
+            if not glob.glob(os.path.join(BASE_DIR, pattern)):
+                return f"missing output {pattern}"
+        current = self.snapshot(stage)
+        changed = sorted(set(current) ^ set(record["files"]))
+        changed += sorted(p for p in current if p in record["files"] and current[p] != record["files"][p])
+        if changed:
+            more = f" (+{len(changed) - 1} more)" if len(changed) > 1 else ""
+            return f"{changed[0]} changed{more}"
+        return None
+
+    def record(self, stage, command):
+        snapshot = self.snapshot(stage)
+        with self.lock:
+            self.data["stages"][stage.name] = {"command": command, "files": snapshot}
+
+    def save(self):
+        state_dir = os.path.dirname(self.path)
+        if state_dir and not os.path.exists(state_dir):
+            os.makedirs(state_dir)
+        tmp_path = self.path + '.tmp'
+        with self.lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def _log(name, line):
+    with _print_lock:
+        print(f"[{name}] {line}", flush=True)
+
+
+def run_stage(stage):
+    """
+    Run one stage, echoing its output; returns (exit code, seconds, MB or None),
+    where MB is the peak RSS of the largest single process in the stage, not the
+    total over its workers.
+    """
+    start = time.perf_counter()
+    proc = subprocess.Popen(stage.command(), cwd=BASE_DIR, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, encoding='utf-8', errors='replace', env=dict(os.environ, PYTHONUNBUFFERED='1'))
+    for line in proc.stdout:
+        _log(stage.name, line.rstrip())
+    proc.stdout.close()
+
+    peak_mb = None
+    if hasattr(os, 'wait4'):
+        # wait4 reports the largest peak RSS of the stage and the worker
+        # processes it reaped, not their sum
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is in KB on Linux, bytes on macOS
+        peak_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    else:
+        proc.wait()
+    return proc.returncode, time.perf_counter() - start, peak_mb
+
+
+def run_pipeline(stages, names, state, jobs=2, force=False, dry_run=False):
+    selected = set(names)
+    pending = {n: [d for d in stages[n].deps if d in selected] for n in names}
+    results = {}
+    set_later_outputs(stages, names)
+
+    if dry_run:
+        # Nothing runs, so a stage is stale if it is stale now or anything upstream would run
+        for name in names:
+            stage = stages[name]
+            reason = "forced" if force else state.reason_to_run(stage, stage.signature())
+            if reason is None and any(results[d] == "run" for d in pending[name]):
+                reason = "upstream would run"
+            results[name] = "run" if reason else "skip"
+            print(f"{name:<12} {'would run: ' + reason if reason else 'up to date'}")
+        return True
+
+    ok = True
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        while pending or running:
+            for name in [n for n, deps in pending.items() if all(d in results for d in deps)]:
+                deps = pending.pop(name)
+                stage = stages[name]
+                failed = [d for d in deps if results[d][0] in ("failed", "blocked")]
+                if failed:
+                    results[name] = ("blocked", None, None)
+                    print(f"Skipping {name}: {', '.join(failed)} did not succeed")
+                    continue
+                missing = missing_inputs(stage)
+                if missing:
+                    ok = False
+                    results[name] = ("blocked", None, None)
+                    print(f"Skipping {name}: missing input {', '.join(missing)}")
+                    continue
+                reason = "forced" if force else state.reason_to_run(stage, stage.signature())
+                if reason is None:
+                    results[name] = ("cached", None, None)
+                    print(f"Skipping {name}: up to date")
+                    continue
+                print(f"Running {name} ({reason}): {' '.join(stage.signature())}")
+                running[executor.submit(run_stage, stage)] = name
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    code, seconds, peak_mb = future.result()
+                except OSError as e:
+                    print(f"Error starting {name}: {e}")
+                    code, seconds, peak_mb = -1, 0.0, None
+                if code == 0:
+                    state.record(stages[name], stages[name].signature())
+                    state.save()
+                    results[name] = ("ran", seconds, peak_mb)
+                else:
+                    ok = False
+                    results[name] = ("failed", seconds, peak_mb)
+                    print(f"Stage {name} failed with exit code {code}")
+
+    print(f"\n{'stage':<12} {'status':<8} {'wall s':>8} {'max proc MB':>12}")
+    for name in names:
+        status, seconds, peak_mb = results[name]
+        wall = f"{seconds:.2f}" if seconds is not None else "-"
+        peak = f"{peak_mb:.0f}" if peak_mb is not None else "-"
+        print(f"{name:<12} {status:<8} {wall:>8} {peak:>12}")
+    state.save()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the wordlist build stages in dependency order, skipping stages whose files are unchanged.")
+    parser.add_argument("targets", nargs="*", help="Stages to bring up to date, with everything upstream (default: all default stages)")
+    parser.add_argument("--jobs", type=int, default=2, help="Independent stages to run at once (default: 2)")
+    parser.add_argument("--workers", type=int, default=1, help="Passed to the stages that support --workers (default: 1)")
+    parser.add_argument("--force", action="store_true", help="Run the selected stages even if they are up to date")
+    parser.add_argument("--dry-run", action="store_true", help="Only report which stages would run")
+    parser.add_argument("--list", action="store_true", help="List the stages and exit")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="Stage hash file (default: .cache/pipeline.json)")
+    args = parser.parse_args()
+
+    stages = build_stages(args.workers)
+    if args.list:
+        for stage in stages.values():
+            deps = f" (after {', '.join(stage.deps)})" if stage.deps else ""
+            optional = "" if stage.default else " [only when named]"
+            print(f"{stage.name:<12} {stage.script}{deps}{optional}")
+        return
+
+    unknown = [t for t in args.targets if t not in stages]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(stages)})")
+
+    names = select_stages(stages, args.targets)
+    state = StageState(args.state)
+    start = time.perf_counter()
+    ok = run_pipeline(stages, names, state, jobs=args.jobs, force=args.force, dry_run=args.dry_run)
+    if not args.dry_run:
+        print(f"\nPipeline {'finished' if ok else 'failed'} in {time.perf_counter() - start:.2f}s")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import bisect
+import os
+import re
+
+from word_rules import RULES_VERSION
+
+# Prefix index over the cleaned reference list, shared by the expansion tools.
+#
+# Words are kept in one sorted array. In lexicographic order every trie subtree
+# ("all words under prefix P") is a contiguous slice, so a prefix query is two
+# bisects instead of a node walk, and the whole index costs one list of strings.
+
+INDEX_MAGIC = "#prefix-index v1"
+
+# Saved indexes record the word rules they were filtered with
+_RULES_TAG = f"rules={RULES_VERSION}"
+
+# Candidates with 3 identical chars in a row (aaa, gymmm) are never expanded into
+TRIPLE_RE = re.compile(r'(.)\1\1')
+
+# Sorts after every character that can appear in a word
+_PREFIX_END = '\U0010ffff'
+
+
+def merge_expand(seeds, words, min_seed_len=3):
+    """
+    Yield every word of sorted `words` that starts with one of sorted `seeds`,
+    in one forward merge over both lists: O(len(seeds) + len(words)), and each
+    word is emitted at most once.
+
+    The reference cursor never moves back: a seed that is not covered by the
+    previous one sorts after that seed's whole subtree.
+    """
+    i = 0
+    n = len(words)
+    covering = None
+    for seed in seeds:
+        if len(seed) < min_seed_len:
+            continue
+        if covering is not None and seed.startswith(covering):
+            continue
+        covering = seed
+        while i < n and words[i] < seed:
+            i += 1
+        while i < n and words[i].startswith(seed):
+            yield words[i]
+            i += 1
+
+
+class PrefixIndex:
+    def __init__(self, words):
+        # `words` must already be sorted and unique
+        self.words = words
+
+    @classmethod
+    def build(cls, words):
+        """Build from any iterable of valid words, dropping repeated-char spam once up front."""
+        return cls(sorted({w for w in words if not TRIPLE_RE.search(w)}))
+
+    def __len__(self):
+        return len(self.words)
+
+    def prefix_range(self, prefix, lo=0):
+        start = bisect.bisect_left(self.words, prefix, lo)
+        end = bisect.bisect_left(self.words, prefix + _PREFIX_END, start)
+        return start, end
+
+    def words_with_prefix(self, prefix):
+        start, end = self.prefix_range(prefix)
+        return self.words[start:end]
+
+    def ranges_for_seeds(self, seeds):
+        """
+        Merged [start, end) ranges covering every word under any of the sorted `seeds`.
+        A seed that extends an earlier seed ("gymnast" after "gym") lies inside that
+        seed's subtree and is skipped without a lookup.
+        """
+        ranges = []
+        covering = None
+        lo = 0
+        for seed in seeds:
+            if covering is not None and seed.startswith(covering):
+                continue
+            covering = seed
+            start, end = self.prefix_range(seed, lo)
+            lo = start
+            if start == end:
+                continue
+            if ranges and start <= ranges[-1][1]:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+            else:
+                ranges.append((start, end))
+        return ranges
+
+    def expand(self, seeds, min_seed_len=3):
+        """All indexed words that start with one of `seeds` (seeds shorter than min_seed_len are ignored)."""
+        seeds = sorted(s for s in set(seeds) if len(s) >= min_seed_len)
+        # With many seeds the bisects cost more than walking the reference once
+        if len(seeds) * max(len(self.words), 2).bit_length() > len(self.words):
+            return list(merge_expand(seeds, self.words, min_seed_len))
+        found = []
+        for start, end in self.ranges_for_seeds(seeds):
+            found.extend(self.words[start:end])
+        return found
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"{INDEX_MAGIC} {len(self.words)} {_RULES_TAG}\n")
+            for w in self.words:
+                f.write(w + '\n')
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            header = f.readline().split()
+            if len(header) != 4 or " ".join(header[:2]) != INDEX_MAGIC:
+                raise ValueError(f"{path} is not a prefix index file")
+            if header[3] != _RULES_TAG:
+                raise ValueError(f"{path} was built with different word rules ({header[3]})")
+            words = f.read().split('\n')
+        if words and words[-1] == '':
+            words.pop()
+        if len(words) != int(header[2]):
+            raise ValueError(f"{path} is truncated ({len(words)} of {header[2]} words)")
+        return cls(words)
+
+
+def load_or_build(reference_path, index_path, load_words):
+    """
+    Reuse `index_path` when it is newer than the reference, otherwise rebuild it
+    from `load_words(reference_path)` and save it for the next run.
+    """
+    try:
+        if os.path.getmtime(index_path) >= os.path.getmtime(reference_path):
+            return PrefixIndex.load(index_path)
+    except (OSError, ValueError):
+        pass
+    index = PrefixIndex.build(load_words(reference_path))
+    try:
+        index.save(index_path)
+    except OSError as e:
+        print(f"Warning: could not save prefix index to {index_path}: {e}")
+    return index
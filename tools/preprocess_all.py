@@ -1,13 +1,19 @@
+import argparse
 import os
-import subprocess
-import sys
+
+from preprocess_wordlist import DEFAULT_CACHE_PATH, preprocess_many
 
 def main():
+    parser = argparse.ArgumentParser(description="Regenerate the JSON for every txt in wordlist/.")
+    parser.add_argument("--incremental", action="store_true", help="Only rescore words that changed since the last JSON was written")
+    parser.add_argument("--workers", type=int, default=1, help="Number of processes (default: 1 = in this process, 0 = all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the persistent score cache")
+    args = parser.parse_args()
+
     # Define directories
     # Go up 2 levels from tools/preprocess_all.py to project root
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     wordlist_dir = os.path.join(base_dir, 'wordlist')
-    tool_path = os.path.join(base_dir, 'tools', 'preprocess_wordlist.py')
 
     if not os.path.exists(wordlist_dir):
         print(f"Error: Wordlist directory not found at {wordlist_dir}")
@@ -16,23 +22,27 @@ def main():
 
     print(f"Scanning {wordlist_dir} for .txt files...")
 
-    files_processed = 0
-    for filename in os.listdir(wordlist_dir):
+    jobs = []
+    for filename in sorted(os.listdir(wordlist_dir)):
         if filename.endswith(".txt"):
             txt_path = os.path.join(wordlist_dir, filename)
             json_path = os.path.join(wordlist_dir, filename.replace(".txt", ".json"))
-            
-            print(f"Processing {filename} -> {os.path.basename(json_path)}...")
-            
-            # Construct command
-            cmd = [sys.executable, tool_path, txt_path, json_path]
-            
-            try:
-                subprocess.run(cmd, check=True)
-                files_processed += 1
-            except subprocess.CalledProcessError as e:
-                print(f"Error processing {filename}: {e}")
+            jobs.append((txt_path, json_path))
 
+    results = preprocess_many(jobs, cache_path=None if args.no_cache else DEFAULT_CACHE_PATH,
+                              incremental=args.incremental, workers=args.workers)
+
+    files_processed = 0
+    total_seconds = 0.0
+    for txt_path, json_path, seconds, result, error in results:
+        total_seconds += seconds
+        if error is not None:
+            print(f"Error processing {os.path.basename(txt_path)}: {error}")
+            continue
+        files_processed += 1
+        detail = f" (+{result[0]} / -{result[1]})" if result else ""
+        print(f"Processed {os.path.basename(txt_path)} -> {os.path.basename(json_path)} in {seconds:.2f}s{detail}")
+    print(f"Total scoring time: {total_seconds:.2f}s")
     print(f"\nDone! Processed {files_processed} files.")
 
 if __name__ == "__main__":
@@ -1,57 +1,198 @@
 import argparse
 import json
+import os
 import sys
-import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     from wordfreq import zipf_frequency
 except Exception as e:
     zipf_frequency = None
 
+from freq_table import bulk_zipf, get_freq_table, wordfreq_version
+from json_stream import write_json_map
+from score_cache import DEFAULT_CACHE_PATH, ScoreCache
+from word_rules import is_valid_word, iter_valid_words, normalize_word
 
-WORD_RE = re.compile(r"^[a-z]+$")
-VOWEL_RE = re.compile(r"[aeiouy]")
+# Bump when the way raw scores are computed changes, to invalidate cached rows
+SCORER_VERSION = "zipf-v1"
 
 
-def normalize_word(w: str) -> str:
-    return w.strip().lower()
+def open_cache(path: str, lang: str = "en") -> ScoreCache:
+    # Cached zipf values are only valid for the wordfreq release they came from
+    return ScoreCache(path, lang=lang, scorer=SCORER_VERSION, model=wordfreq_version() or "")
 
+# Written next to each output JSON (nouns.json -> nouns.json.params) with the
+# settings its values were produced with; not .json, so no *.json glob picks it up
+PARAMS_EXT = ".params"
 
-def is_valid_word(w: str) -> bool:
-    return len(w) >= 2 and bool(WORD_RE.match(w)) and bool(VOWEL_RE.search(w))
+
+def raw_zipf(w: str, lang: str = "en") -> float:
+    if zipf_frequency is None:
+        return 0.0
+    try:
+        return float(zipf_frequency(w, lang))
+    except Exception:
+        return 0.0
 
 
 def compute_freq(word: str, lang: str = "en", decimals: int = 2) -> float:
     w = normalize_word(word)
     if not w or not is_valid_word(w):
         return 0.0
-    if zipf_frequency is None:
-        return 0.0
-    try:
-        val = float(zipf_frequency(w, lang))
-    except Exception:
-        val = 0.0
     # round to requested decimals
-    return round(val, decimals)
-
-
-def preprocess(input_path: str, output_path: str, lang: str = "en", decimals: int = 2, min_freq: float = 0.0):
-    pairs = []
-    seen = set()
-    with open(input_path, "r", encoding="utf-8") as f:
-        for line in f:
-            w = normalize_word(line)
-            if not w or w in seen or not is_valid_word(w):
-                continue
-            seen.add(w)
-            val = compute_freq(w, lang=lang, decimals=decimals)
-            if val > min_freq:
-                pairs.append((w, val))
-    # sort descending by frequency for stable writing order
-    pairs.sort(key=lambda x: x[1], reverse=True)
-    mapping = {w: v for (w, v) in pairs}
-    with open(output_path, "w", encoding="utf-8") as out:
-        json.dump(mapping, out, ensure_ascii=False, indent=2)
+    return round(raw_zipf(w, lang), decimals)
+
+
+def load_words(input_path: str) -> list:
+    # First occurrence order, deduplicated without a separate seen set
+    return list(dict.fromkeys(iter_valid_words(input_path)))
+
+
+def score_words(words, lang: str = "en", decimals: int = 2, cache: ScoreCache = None) -> dict:
+    cached = cache.get_many(words) if cache is not None else {}
+    # One merge join against the local frequency table for everything uncached
+    fresh = bulk_zipf([w for w in words if w not in cached], lang) if zipf_frequency is not None else {}
+    computed = []
+    scores = {}
+    for w in words:
+        if w in cached:
+            raw = cached[w][0]
+        else:
+            raw = fresh.get(w, 0.0)
+            computed.append((w, raw, None))
+        scores[w] = round(raw, decimals)
+    if cache is not None and computed:
+        cache.put_many(computed)
+    return scores
+
+
+def write_mapping(words, scores: dict, output_path: str, min_freq: float = 0.0):
+    """Stream {word: score} to output_path, highest score first."""
+    # sort descending by frequency for stable writing order; words are unique,
+    # so members go straight to the file without building the mapping
+    ordered = sorted((w for w in words if scores[w] > min_freq), key=scores.__getitem__, reverse=True)
+    write_json_map(output_path, ((w, scores[w]) for w in ordered))
+
+
+def _params(lang: str, decimals: int, min_freq: float) -> dict:
+    return {"lang": lang, "decimals": decimals, "min_freq": min_freq}
+
+
+def load_params(output_path: str):
+    """The settings recorded for output_path, or None when unknown."""
+    try:
+        with open(output_path + PARAMS_EXT, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_params(output_path: str, params: dict):
+    tmp_path = output_path + PARAMS_EXT + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(params, f, sort_keys=True)
+    os.replace(tmp_path, output_path + PARAMS_EXT)
+
+
+def preprocess(input_path: str, output_path: str, lang: str = "en", decimals: int = 2, min_freq: float = 0.0,
+               cache: ScoreCache = None):
+    words = load_words(input_path)
+    scores = score_words(words, lang=lang, decimals=decimals, cache=cache)
+    write_mapping(words, scores, output_path, min_freq=min_freq)
+    save_params(output_path, _params(lang, decimals, min_freq))
+
+
+def preprocess_incremental(input_path: str, output_path: str, lang: str = "en", decimals: int = 2,
+                           min_freq: float = 0.0, cache: ScoreCache = None):
+    """
+    Bring an existing JSON in line with its txt: score only words that are not
+    in the JSON yet and drop the ones that disappeared from the txt.
+    Falls back to a full preprocess when there is no usable JSON, or when it was
+    written with a different lang, decimals or min_freq (or unknown ones).
+    Returns (added, removed) counts, or None after a full preprocess.
+    """
+    existing = None
+    if load_params(output_path) == _params(lang, decimals, min_freq):
+        try:
+            with open(output_path, "r", encoding="utf-8") as f:
+                existing = json.load(f)
+        except (FileNotFoundError, ValueError):
+            pass
+    if existing is None:
+        preprocess(input_path, output_path, lang=lang, decimals=decimals, min_freq=min_freq, cache=cache)
+        return None
+
+    words = load_words(input_path)
+    current = set(words)
+    removed = [w for w in existing if w not in current]
+    # Words at or below min_freq are never written, so they show up as "added" on
+    # every run; the score cache keeps that cheap.
+    added = [w for w in words if w not in existing]
+
+    scores = score_words(added, lang=lang, decimals=decimals, cache=cache)
+    inserted = [w for w in added if scores[w] > min_freq]
+    for w in words:
+        if w not in scores:
+            scores[w] = existing[w]
+
+    if inserted or removed:
+        write_mapping(words, scores, output_path, min_freq=min_freq)
+    return len(inserted), len(removed)
+
+
+_batch_cache = None
+
+
+def _init_batch(lang: str, cache_path: str):
+    # Open the frequency table and cache connection once per process, not once per file
+    global _batch_cache
+    if zipf_frequency is not None:
+        get_freq_table(lang)
+    _batch_cache = open_cache(cache_path, lang) if cache_path else None
+
+
+def _run_batch_job(job):
+    input_path, output_path, lang, decimals, min_freq, incremental = job
+    start = time.perf_counter()
+    result = None
+    error = None
+    try:
+        if incremental:
+            result = preprocess_incremental(input_path, output_path, lang=lang, decimals=decimals,
+                                            min_freq=min_freq, cache=_batch_cache)
+        else:
+            preprocess(input_path, output_path, lang=lang, decimals=decimals, min_freq=min_freq, cache=_batch_cache)
+    except Exception as e:
+        # One bad file should not abort the rest of the batch
+        error = e
+    return input_path, output_path, time.perf_counter() - start, result, error
+
+
+def preprocess_many(jobs, lang: str = "en", decimals: int = 2, min_freq: float = 0.0,
+                    cache_path: str = DEFAULT_CACHE_PATH, incremental: bool = False, workers: int = 1):
+    """
+    Preprocess a batch of (input_path, output_path) pairs inside this interpreter,
+    or across a pool of `workers` processes (0 = all cores).
+    Returns a list of (input_path, output_path, seconds, incremental_result, error) in job order.
+    """
+    global _batch_cache
+    tasks = [(i, o, lang, decimals, min_freq, incremental) for (i, o) in jobs]
+    if zipf_frequency is not None:
+        # Dump the frequency table here if needed, so workers do not race to build it
+        get_freq_table(lang)
+    if workers == 1 or len(tasks) <= 1:
+        _init_batch(lang, cache_path)
+        try:
+            return [_run_batch_job(t) for t in tasks]
+        finally:
+            if _batch_cache is not None:
+                _batch_cache.close()
+                _batch_cache = None
+    with ProcessPoolExecutor(max_workers=workers or None, initializer=_init_batch,
+                             initargs=(lang, cache_path)) as executor:
+        return list(executor.map(_run_batch_job, tasks))
 
 
 def main():
@@ -61,13 +202,28 @@ def main():
     parser.add_argument("--lang", default="en", help="Language code for wordfreq (default: en)")
     parser.add_argument("--decimals", type=int, default=2, help="Rounding decimals (default: 2)")
     parser.add_argument("--min-freq", type=float, default=0.0, help="Filter out entries with zipf < min-freq (default: 0.0)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Path to the persistent score cache (SQLite)")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every score without reading or writing the cache")
+    parser.add_argument("--incremental", action="store_true", help="Only score words missing from the existing output JSON and drop removed ones")
     args = parser.parse_args()
 
     if zipf_frequency is None:
         print("ERROR: 'wordfreq' library not available. Install with: python -m pip install wordfreq", file=sys.stderr)
         sys.exit(1)
 
-    preprocess(args.input, args.output, lang=args.lang, decimals=args.decimals, min_freq=args.min_freq)
+    cache = None if args.no_cache else open_cache(args.cache, args.lang)
+    if args.incremental:
+        result = preprocess_incremental(args.input, args.output, lang=args.lang, decimals=args.decimals,
+                                        min_freq=args.min_freq, cache=cache)
+        if result is None:
+            print("No existing JSON with the same settings found, ran a full preprocess.")
+        else:
+            print(f"Incremental update: +{result[0]} scored, -{result[1]} removed")
+    else:
+        preprocess(args.input, args.output, lang=args.lang, decimals=args.decimals, min_freq=args.min_freq, cache=cache)
+    if cache is not None:
+        print(f"Score {cache.stats()}")
+        cache.close()
     print(f"Wrote JSON to {args.output}")
 
 
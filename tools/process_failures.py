@@ -1,11 +1,27 @@
+import argparse
 import os
 import subprocess
 import sys
 
 def main():
+    parser = argparse.ArgumentParser(description="Blacklist the words in the failure logs and remove them from the wordlists.")
+    parser.add_argument("--watch", action="store_true", help="Keep running and apply new failures as the logs grow (see fail/watch_failures.py)")
+    parser.add_argument("--window", type=float, default=2.0, help="With --watch: seconds to batch new words before applying them (default: 2)")
+    args = parser.parse_args()
+
     tools_dir = os.path.dirname(os.path.abspath(__file__))
     extract_script = os.path.join(tools_dir, 'fail', 'extract_failed_words.py')
     remove_script = os.path.join(tools_dir, 'fail', 'remove_failed_words.py')
+    watch_script = os.path.join(tools_dir, 'fail', 'watch_failures.py')
+
+    if args.watch:
+        try:
+            subprocess.run([sys.executable, watch_script, "--window", str(args.window)], check=True)
+        except KeyboardInterrupt:
+            pass
+        except subprocess.CalledProcessError as e:
+            print(f"Error watching failure logs: {e}")
+        return
 
     print("=== Step 1: Extracting failed words ===")
     try:
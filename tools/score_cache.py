@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import sqlite3
+
+# Shared on-disk cache for per-word scores, used by preprocess_wordlist.py and
+# generate_freq_json.py. Rows are keyed by (word, lang, scorer, model) so a change
+# of scorer version or bigram model simply misses instead of returning stale data.
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_PATH = os.path.join(BASE_DIR, '.cache', 'scores.sqlite')
+
+# SQLite limits the number of bound parameters per statement
+_QUERY_BATCH = 500
+
+
+def model_hash(obj) -> str:
+    """Stable short hash of any JSON-serialisable model description."""
+    blob = json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha1(blob).hexdigest()[:16]
+
+
+def file_hash(path, block_size=1 << 20) -> str:
+    """sha1 of a file's contents, read in blocks."""
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ScoreCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, lang="en", scorer="", model=""):
+        self.path = path
+        self.lang = lang
+        self.scorer = scorer
+        self.model = model
+        self.hits = 0
+        self.misses = 0
+
+        cache_dir = os.path.dirname(path)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+        # Parallel batch workers share the file, so wait on locks instead of failing
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " word TEXT NOT NULL, lang TEXT NOT NULL, scorer TEXT NOT NULL, model TEXT NOT NULL,"
+            " freq REAL, like REAL,"
+            " PRIMARY KEY (word, lang, scorer, model)) WITHOUT ROWID"
+        )
+
+    def get_many(self, words):
+        """Return {word: (freq, like)} for every word already in the cache."""
+        found = {}
+        words = list(words)
+        for i in range(0, len(words), _QUERY_BATCH):
+            batch = words[i:i + _QUERY_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT word, freq, like FROM scores"
+                f" WHERE lang = ? AND scorer = ? AND model = ? AND word IN ({placeholders})",
+                [self.lang, self.scorer, self.model] + batch,
+            )
+            for word, freq, like in rows:
+                found[word] = (freq, like)
+        self.hits += len(found)
+        self.misses += len(words) - len(found)
+        return found
+
+    def put_many(self, items):
+        """Store an iterable of (word, freq, like) tuples."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO scores (word, lang, scorer, model, freq, like) VALUES (?, ?, ?, ?, ?, ?)",
+                ((w, self.lang, self.scorer, self.model, f, l) for (w, f, l) in items),
+            )
+
+    def stats(self):
+        return f"cache hits: {self.hits}, misses: {self.misses}"
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
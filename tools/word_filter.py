@@ -0,0 +1,293 @@
+import argparse
+import glob
+import hashlib
+import math
+import mmap
+import os
+import struct
+
+from binary_wordlist import BinaryWordlist, export_json, load_json_entries, write_binary
+
+# Bloom filters over the category wordlists and the failed-word blacklist, so
+# membership checks that are mostly "no" never touch the full list.
+#
+# A filter is a .bloom file next to its source (nouns.json -> nouns.bloom,
+# nouns.txt -> nouns.txt.bloom, so a txt and its JSON never share one), mmapped,
+# so opening it costs nothing and the pages are shared between processes. The
+# exact store behind it is the .wlb file of the same name: the exported binary
+# wordlist for a JSON, a word-only one for a txt. Only words the filter lets
+# through (members, plus about fp_rate of the rest) are looked up there, and it
+# is only opened on the first such word.
+#
+# A filter older than its source may be missing words added since, so it is
+# only used while both it and the exact store are at least as new as the
+# source; otherwise lookups go to the source itself.
+#
+# Layout (little-endian):
+#   header : magic(8s) hashes(u32) count(u32) bits(u64)
+#   bits   : bits / 8 bytes, bit i is byte i >> 3, mask 1 << (i & 7)
+#
+# Bit positions use double hashing over a 128-bit blake2b digest of the UTF-8
+# word: h1 + i * h2 mod bits, for i < hashes. blake2b is stable across processes,
+# unlike hash().
+
+MAGIC = b"WLBLOOM1"
+HEADER = struct.Struct("<8sIIQ")
+_DIGEST = struct.Struct("<QQ")
+
+DEFAULT_FP_RATE = 0.01
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _stem(source):
+    base, ext = os.path.splitext(source)
+    return source if ext == ".txt" else base
+
+
+def filter_path(source):
+    return _stem(source) + ".bloom"
+
+
+def exact_path(source):
+    return _stem(source) + ".wlb"
+
+
+def bloom_size(count, fp_rate=DEFAULT_FP_RATE):
+    """(bits, hashes) for `count` words at the given false-positive rate."""
+    if not 0 < fp_rate < 1:
+        raise ValueError("fp_rate must be between 0 and 1")
+    count = max(count, 1)
+    bits = max(8, math.ceil(-count * math.log(fp_rate) / math.log(2) ** 2))
+    hashes = max(1, round(bits / count * math.log(2)))
+    return bits, hashes
+
+
+def _bit_positions(word, hashes, bits):
+    h1, h2 = _DIGEST.unpack(hashlib.blake2b(word.encode("utf-8"), digest_size=16).digest())
+    # An odd step never cycles early when bits is even
+    h2 |= 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+def write_filter(path, words, fp_rate=DEFAULT_FP_RATE):
+    """Write a Bloom filter holding `words` (deduplicated here). Returns (count, bits, hashes)."""
+    words = set(words)
+    bits, hashes = bloom_size(len(words), fp_rate)
+    table = bytearray((bits + 7) // 8)
+    for word in words:
+        for i in _bit_positions(word, hashes, bits):
+            table[i >> 3] |= 1 << (i & 7)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, hashes, len(words), bits))
+        f.write(table)
+    # Readers may have the old file mapped; replace atomically
+    os.replace(tmp_path, path)
+    return len(words), bits, hashes
+
+
+class BloomFilter:
+    """Read-only, mmapped view of a .bloom file."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.hashes, self.count, self.bits = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a Bloom filter")
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def might_contain(self, word):
+        """False means `word` is certainly not in the list; True means it may be."""
+        mm = self._mm
+        start = HEADER.size
+        for i in _bit_positions(word, self.hashes, self.bits):
+            if not mm[start + (i >> 3)] & (1 << (i & 7)):
+                return False
+        return True
+
+    __contains__ = might_contain
+
+    @property
+    def fp_rate(self):
+        """Expected false-positive rate for the words it was built from."""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+
+def _source_words(source):
+    if source.endswith(".json"):
+        return [word for word, _, _ in load_json_entries(source)]
+    # One word per line, compared lowercased like the blacklist
+    with open(source, "r", encoding="utf-8") as f:
+        return [w for w in (line.strip().lower() for line in f) if w]
+
+
+_MISSING = object()
+
+
+def _source_entries(source):
+    # Same word -> (freq, like) answers as the exact store, straight from the source
+    if source.endswith(".json"):
+        return {word: (freq, like) for word, freq, like in load_json_entries(source)}
+    return dict.fromkeys(_source_words(source), (None, None))
+
+
+def _is_fresh(path, source):
+    return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source)
+
+
+def has_fresh_filter(source):
+    """True when the filter and exact store for `source` are at least as new as it."""
+    return _is_fresh(filter_path(source), source) and _is_fresh(exact_path(source), source)
+
+
+def build_for(source, fp_rate=DEFAULT_FP_RATE, force=False):
+    """Write the filter and exact store for `source` unless both are newer. Returns the filter path."""
+    bloom_path = filter_path(source)
+    wlb_path = exact_path(source)
+    if not force and has_fresh_filter(source):
+        print(f"Up to date: {os.path.basename(bloom_path)}")
+        return bloom_path
+
+    # Freshness is judged by mtime, so the outputs get the mtime the source had
+    # before it was read: anything appended during the build leaves them stale
+    source_mtime_ns = os.stat(source).st_mtime_ns
+    words = _source_words(source)
+    if source.endswith(".json"):
+        export_json(source, wlb_path)
+    else:
+        write_binary(wlb_path, ((w, None, None) for w in words))
+    count, bits, hashes = write_filter(bloom_path, words, fp_rate)
+    for path in (wlb_path, bloom_path):
+        os.utime(path, ns=(os.stat(path).st_atime_ns, source_mtime_ns))
+    print(f"Built {os.path.basename(bloom_path)}: {count} words, {(bits + 7) // 8} bytes, "
+          f"{hashes} hashes, target false-positive rate {fp_rate:g}")
+    return bloom_path
+
+
+class FilteredWordlist:
+    """
+    Membership and scores for one wordlist: the Bloom filter answers most
+    misses, and the exact .wlb store is opened on the first possible hit.
+    Without an up-to-date filter, the source is loaded and answers everything.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.bloom = None
+        self._exact_path = exact_path(source)
+        self._exact = None
+        self._entries = None
+        if has_fresh_filter(source):
+            self.bloom = BloomFilter(filter_path(source))
+        else:
+            self._entries = _source_entries(source)
+        self.queries = 0
+        self.rejected = 0
+        self.false_positives = 0
+
+    @property
+    def filtered(self):
+        return self.bloom is not None
+
+    def close(self):
+        if self.bloom is not None:
+            self.bloom.close()
+        if self._exact is not None:
+            self._exact.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.bloom) if self.bloom is not None else len(self._entries)
+
+    def __contains__(self, word):
+        return self.get(word, _MISSING) is not _MISSING
+
+    def get(self, word, default=None):
+        """(freq, like) for `word`, or `default` when it is not in the list."""
+        self.queries += 1
+        if self._entries is not None:
+            return self._entries.get(word, default)
+        if not self.bloom.might_contain(word):
+            self.rejected += 1
+            return default
+        if self._exact is None:
+            self._exact = BinaryWordlist(self._exact_path)
+        i = self._exact.index(word)
+        if i < 0:
+            self.false_positives += 1
+            return default
+        return self._exact.scores_at(i)
+
+    def stats(self):
+        return {"filtered": self.filtered, "queries": self.queries, "rejected": self.rejected,
+                "false_positives": self.false_positives}
+
+
+def default_sources():
+    return (sorted(glob.glob(os.path.join(BASE_DIR, 'wordlist_new', 'json', '*.json')))
+            + sorted(glob.glob(os.path.join(BASE_DIR, 'wordlist', '*.txt')))
+            + [os.path.join(BASE_DIR, 'fail_filter', 'fail1_clean.txt')])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build Bloom filters for the category wordlists and the blacklist, or query one.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="Write <name>.bloom and <name>.wlb next to each source")
+    p_build.add_argument("paths", nargs="*", help="JSON or txt wordlists, or directories of JSON (default: wordlist_new/json, wordlist/*.txt and the blacklist)")
+    p_build.add_argument("--fp-rate", type=float, default=DEFAULT_FP_RATE, help=f"Target false-positive rate (default: {DEFAULT_FP_RATE})")
+    p_build.add_argument("--force", action="store_true", help="Rebuild even if the filter is newer than its source")
+
+    p_query = sub.add_parser("query", help="Check words against a wordlist through its filter")
+    p_query.add_argument("source", help="The wordlist the filter was built from")
+    p_query.add_argument("words", nargs="+", help="Words to check")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        sources = []
+        for path in args.paths or default_sources():
+            if os.path.isdir(path):
+                sources.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+            elif os.path.exists(path):
+                sources.append(path)
+            else:
+                print(f"Warning: File not found: {path}")
+        for source in sources:
+            try:
+                build_for(source, args.fp_rate, force=args.force)
+            except Exception as e:
+                print(f"Error building filter for {source}: {e}")
+    else:
+        with FilteredWordlist(args.source) as wl:
+            if wl.filtered:
+                print(f"{filter_path(args.source)}: {len(wl)} words, expected false-positive rate {wl.bloom.fp_rate:.4f}")
+            else:
+                print(f"No up-to-date filter for {args.source}, using the list itself ({len(wl)} words)")
+            for word in args.words:
+                print(f"{word}: {wl.get(word.strip().lower(), 'not found')}")
+            print(wl.stats())
+
+
+if __name__ == "__main__":
+    main()
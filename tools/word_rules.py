@@ -0,0 +1,143 @@
+import re
+
+# Single source of truth for what counts as a valid word, shared by
+# clean_reference.py, preprocess_wordlist.py, expand_wordlist.py and
+# expand/expand_by_input.py.
+#
+# 1. Strict a-z (implies no space, dash, apostrophe, symbols, numbers)
+# 2. Length check (min 2 chars)
+# 3. Must contain at least one vowel (including y)
+# 4. No repeated char spam (max 2 consecutive identical chars allowed), "aa" ok, "aaa" bad
+# 5. Anti-consonant cluster extreme: English words can have 6 consecutive
+#    consonants ('catchphrase' -> 'tchphr'), so 7 or more are rejected
+#
+# All five rules are folded into one compiled pattern so a word is checked in a
+# single regex pass; the individual rules below are only consulted to explain
+# rejections.
+
+# Bump whenever the rules change, so derived artifacts (e.g. prefix indexes) rebuild
+RULES_VERSION = 1
+
+RULES = ('empty', 'charset', 'length', 'vowel', 'repeat', 'consonants')
+
+_VALID = (
+    r"(?=[a-z]*[aeiouy])"                    # 3. vowel
+    r"(?![a-z]*?(?P<ch>[a-z])(?P=ch)(?P=ch))" # 4. no triple
+    r"(?![a-z]*?[bcdfghjklmnpqrstvwxz]{7})"  # 5. consonant cluster
+    r"[a-z]{2,}"                             # 1. + 2. charset, length
+)
+VALID_WORD_RE = re.compile(_VALID)
+
+# Same pattern for raw (lowercased) bytes lines, so file buffers can be checked
+# without decoding every line
+_VALID_BYTES_RE = re.compile(_VALID.encode('ascii'))
+
+_CHARSET_RE = re.compile(r"[a-z]+")
+_VOWEL_RE = re.compile(r"[aeiouy]")
+_REPEAT_RE = re.compile(r"(.)\1\1")
+_CONSONANTS_RE = re.compile(r"[bcdfghjklmnpqrstvwxz]{7,}")
+
+
+def normalize_word(w: str) -> str:
+    return w.strip().lower()
+
+
+def is_valid_word(w: str) -> bool:
+    return VALID_WORD_RE.fullmatch(w) is not None
+
+
+def rejection_reason(w: str):
+    """Name of the first rule `w` breaks, or None if it is valid."""
+    if not w:
+        return 'empty'
+    if not _CHARSET_RE.fullmatch(w):
+        return 'charset'
+    if len(w) < 2:
+        return 'length'
+    if not _VOWEL_RE.search(w):
+        return 'vowel'
+    if _REPEAT_RE.search(w):
+        return 'repeat'
+    if _CONSONANTS_RE.search(w):
+        return 'consonants'
+    return None
+
+
+def new_counts():
+    return dict.fromkeys(('accepted',) + RULES, 0)
+
+
+def validate_batch(words, counts=None):
+    """
+    Check a batch of already-normalised words.
+    Returns (mask, counts): mask[i] is True when words[i] is valid, counts holds
+    the number accepted plus the number rejected by each rule.
+    """
+    if counts is None:
+        counts = new_counts()
+    fullmatch = VALID_WORD_RE.fullmatch
+    mask = [fullmatch(w) is not None for w in words]
+    accepted = sum(mask)
+    counts['accepted'] += accepted
+    if accepted != len(mask):
+        for w, ok in zip(words, mask):
+            if not ok:
+                counts[rejection_reason(w)] += 1
+    return mask, counts
+
+
+def scan_buffer(data: bytes, counts=None):
+    """
+    Validate a whole buffer of newline-separated words at the bytes level.
+    `data` must hold complete lines (no trailing partial line).
+    Returns (words, counts) with accepted words in file order; only rejected
+    lines are decoded, to attribute them to a rule.
+    """
+    if counts is None:
+        counts = new_counts()
+    lines = data.lower().split(b'\n')
+    if lines and lines[-1] == b'':
+        lines.pop()
+    fullmatch = _VALID_BYTES_RE.fullmatch
+    words = []
+    for line in lines:
+        if fullmatch(line) is None:
+            stripped = line.strip()
+            if len(stripped) == len(line) or fullmatch(stripped) is None:
+                counts[rejection_reason(stripped.decode('utf-8', 'replace'))] += 1
+                continue
+            line = stripped
+        words.append(line.decode('ascii'))
+    counts['accepted'] += len(words)
+    return words, counts
+
+
+def iter_valid_words(path, counts=None, block_size=1 << 22):
+    """
+    Stream the valid (normalised) words of a one-word-per-line file, scanning it
+    in blocks of complete lines. Per-rule counts accumulate in `counts`.
+    """
+    if counts is None:
+        counts = new_counts()
+    with open(path, 'rb') as f:
+        tail = b''
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b'\n')
+            if cut < 0:
+                tail = block
+                continue
+            tail = block[cut + 1:]
+            words, _ = scan_buffer(block[:cut + 1], counts)
+            yield from words
+        if tail:
+            words, _ = scan_buffer(tail, counts)
+            yield from words
+
+
+def format_counts(counts):
+    rejected = ", ".join(f"{rule}: {counts[rule]}" for rule in RULES if counts[rule])
+    return f"accepted {counts['accepted']}" + (f", rejected ({rejected})" if rejected else "")
@@ -0,0 +1,249 @@
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+
+import nltk
+
+from binary_wordlist import BinaryWordlist, write_binary
+from score_cache import DEFAULT_CACHE_PATH
+
+# Precomputed WordNet part-of-speech index, so classification and lemmatisation
+# do not go through the NLTK corpus reader (and build Synset objects) per word.
+#
+# The index is a .wlb file keyed by surface form, with a one-byte POS column:
+#   low nibble   POS_BITS of every POS for which wordnet.synsets(form) finds a
+#                synset, i.e. morphy(form, pos) is non-empty
+#   high nibble  the same bits for the POS the form itself is a WordNet lemma of
+# The morphy exception lists are kept in a small JSON next to it; together they
+# are enough to lemmatise like WordNetLemmatizer without loading WordNet.
+
+NOUN, VERB, ADJ, ADV = 'n', 'v', 'a', 'r'
+POS_LIST = (NOUN, VERB, ADJ, ADV)
+POS_BITS = {NOUN: 1, VERB: 2, ADJ: 4, ADV: 8}
+LEMMA_SHIFT = 4
+
+# Names used by classify_words for each POS
+POS_NAMES = {NOUN: 'noun', VERB: 'verb', ADJ: 'adj', ADV: 'adv'}
+
+# Same rules as nltk's WordNetCorpusReader.MORPHOLOGICAL_SUBSTITUTIONS
+MORPHOLOGICAL_SUBSTITUTIONS = {
+    NOUN: [
+        ("s", ""),
+        ("ses", "s"),
+        ("ves", "f"),
+        ("xes", "x"),
+        ("zes", "z"),
+        ("ches", "ch"),
+        ("shes", "sh"),
+        ("men", "man"),
+        ("ies", "y"),
+    ],
+    VERB: [
+        ("s", ""),
+        ("ies", "y"),
+        ("es", "e"),
+        ("es", ""),
+        ("ed", "e"),
+        ("ed", ""),
+        ("ing", "e"),
+        ("ing", ""),
+    ],
+    ADJ: [("er", ""), ("est", ""), ("er", "e"), ("est", "e")],
+    ADV: [],
+}
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), f"wordnet-pos-nltk{nltk.__version__}.wlb")
+
+_index = None
+
+
+def _exceptions_path(path):
+    return os.path.splitext(path)[0] + ".exc.json"
+
+
+def morphy(form, pos, is_lemma, exceptions):
+    """
+    Port of WordNetCorpusReader._morphy: the WordNet lemmas `form` may be an
+    inflection of. `is_lemma(form, pos)` answers lemma membership and
+    `exceptions` is the {form: [bases]} exception list for `pos`.
+    """
+    if form in exceptions:
+        forms = exceptions[form]
+    else:
+        forms = [form[:-len(old)] + new for old, new in MORPHOLOGICAL_SUBSTITUTIONS[pos] if form.endswith(old)]
+    result = []
+    seen = set()
+    for candidate in [form] + forms:
+        if candidate not in seen and is_lemma(candidate, pos):
+            result.append(candidate)
+            seen.add(candidate)
+    return result
+
+
+def pos_names(mask):
+    """classify_words POS names ({'noun', 'verb', 'adj', 'adv'}) set in `mask`."""
+    return {POS_NAMES[p] for p in POS_LIST if mask & POS_BITS[p]}
+
+
+def build_pos_index(path=DEFAULT_INDEX_PATH, wordnet=None):
+    if wordnet is None:
+        from nltk.corpus import wordnet
+
+    start = time.perf_counter()
+    wordnet.ensure_loaded()
+    # The reader's own parsed index and exception files, so the lemma sets match
+    # exactly what wordnet.synsets() looks forms up in
+    lemma_map = wordnet._lemma_pos_offset_map
+    exceptions = {p: wordnet._exception_map[p] for p in POS_LIST}
+
+    lemmas = {p: set() for p in POS_LIST}
+    masks = defaultdict(int)
+    for lemma, by_pos in lemma_map.items():
+        for p in POS_LIST:
+            if by_pos.get(p):
+                lemmas[p].add(lemma)
+                masks[lemma] |= POS_BITS[p] << LEMMA_SHIFT
+
+    def is_lemma(form, pos):
+        return form in lemmas[pos]
+
+    for p in POS_LIST:
+        # Every form morphy can map onto a lemma: the lemma itself, the rules
+        # run backwards, and the exception list entries
+        candidates = set(lemmas[p])
+        for lemma in lemmas[p]:
+            for old, new in MORPHOLOGICAL_SUBSTITUTIONS[p]:
+                if lemma.endswith(new):
+                    candidates.add(lemma[:len(lemma) - len(new)] + old)
+        candidates.update(exceptions[p])
+        for form in candidates:
+            if morphy(form, p, is_lemma, exceptions[p]):
+                masks[form] |= POS_BITS[p]
+
+    out_dir = os.path.dirname(path)
+    if out_dir and not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+    count = write_binary(path, ((form, None, None, mask) for form, mask in masks.items()))
+    tmp_path = _exceptions_path(path) + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"wordnet": wordnet.get_version(), "exceptions": exceptions}, f, separators=(',', ':'))
+    os.replace(tmp_path, _exceptions_path(path))
+    print(f"Built WordNet POS index: {count} forms -> {path} ({time.perf_counter() - start:.1f}s)")
+    return path
+
+
+class WordNetPosIndex:
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.wl = BinaryWordlist(path)
+        with open(_exceptions_path(path), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.wordnet_version = meta["wordnet"]
+        self.exceptions = meta["exceptions"]
+
+    def close(self):
+        self.wl.close()
+
+    def _mask(self, form):
+        i = self.wl.index(form)
+        return self.wl.pos_at(i) if i >= 0 else 0
+
+    def mask(self, word):
+        # wordnet.synsets() lowercases its input; morphy itself does not
+        return self._mask(word.lower())
+
+    def masks(self, words):
+        """{word: mask} for a batch, via one join against the index."""
+        found = self.wl.positions(w.lower() for w in words)
+        return {w: self.wl.pos_at(found[w.lower()]) if w.lower() in found else 0 for w in words}
+
+    def pos_set(self, word):
+        """Same answer as {synset.pos()} over wordnet.synsets(word), with a/s both as 'adj'."""
+        return pos_names(self.mask(word))
+
+    def is_lemma(self, form, pos):
+        return bool(self._mask(form) & (POS_BITS[pos] << LEMMA_SHIFT))
+
+    def morphy(self, form, pos):
+        return morphy(form, pos, self.is_lemma, self.exceptions[pos])
+
+    def lemmatize(self, word, pos=NOUN):
+        """Same result as WordNetLemmatizer().lemmatize(word, pos)."""
+        if not self._mask(word) & POS_BITS[pos]:
+            return word
+        lemmas = self.morphy(word, pos)
+        return min(lemmas, key=len) if lemmas else word
+
+    def lemmatize_many(self, words, pos=NOUN):
+        """{word: lemmatize(word, pos)} for a batch, with two joins instead of a lookup per form."""
+        bit = POS_BITS[pos]
+        lemma_bit = bit << LEMMA_SHIFT
+        exceptions = self.exceptions[pos]
+        found = self.wl.positions(words)
+        todo = [w for w in found if self.wl.pos_at(found[w]) & bit]
+
+        forms = set(todo)
+        for w in todo:
+            if w in exceptions:
+                forms.update(exceptions[w])
+            else:
+                forms.update(w[:-len(old)] + new for old, new in MORPHOLOGICAL_SUBSTITUTIONS[pos] if w.endswith(old))
+        form_positions = self.wl.positions(forms)
+        lemma_forms = {f for f, i in form_positions.items() if self.wl.pos_at(i) & lemma_bit}
+
+        result = {w: w for w in words}
+        for w in todo:
+            lemmas = morphy(w, pos, lambda form, _pos: form in lemma_forms, exceptions)
+            if lemmas:
+                result[w] = min(lemmas, key=len)
+        return result
+
+
+def get_pos_index(build=True):
+    """The open POS index, building it from the WordNet data if needed; None without WordNet."""
+    global _index
+    if _index is not None:
+        return _index
+    path = DEFAULT_INDEX_PATH
+    if not (os.path.exists(path) and os.path.exists(_exceptions_path(path))):
+        if not build:
+            return None
+        try:
+            build_pos_index(path)
+        except LookupError:
+            return None
+    _index = WordNetPosIndex(path)
+    return _index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the WordNet lemma -> POS bitmask index used by classify_words and generate_freq_json.")
+    parser.add_argument("--out", default=DEFAULT_INDEX_PATH, help="Index path (default: .cache/wordnet-pos-nltk<version>.wlb)")
+    parser.add_argument("--check", help="Compare the index against wordnet.synsets / WordNetLemmatizer for the words in this txt")
+    args = parser.parse_args()
+
+    build_pos_index(args.out)
+    if not args.check:
+        return
+
+    from nltk.corpus import wordnet
+    from nltk.stem import WordNetLemmatizer
+    lemmatizer = WordNetLemmatizer()
+    index = WordNetPosIndex(args.out)
+    with open(args.check, 'r', encoding='utf-8') as f:
+        words = [line.strip() for line in f if line.strip()]
+    mismatches = 0
+    for word in words:
+        expected = {POS_NAMES[ADJ] if s.pos() == 's' else POS_NAMES[s.pos()] for s in wordnet.synsets(word)}
+        ok = index.pos_set(word) == expected
+        ok = ok and all(index.lemmatize(word, p) == lemmatizer.lemmatize(word, p) for p in POS_LIST)
+        if not ok:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"Mismatch: {word}")
+    print(f"Checked {len(words)} words, {mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()